@@ -23,33 +23,57 @@ Uso:
   python scraper_competicion.py --competicion "copa andalucia a"   # Filtrar competición
   python scraper_competicion.py --categoria "Senior Fem"           # Filtrar categoría
   python scraper_competicion.py --watch                            # Modo cron
-  python scraper_competicion.py --headless                         # Intentar headless
+  python scraper_competicion.py --headed                           # Navegador visible (depuración)
 """
 
 import asyncio
+import functools
+import hashlib
 import json
+import os
 import re
 import sys
 import argparse
 import random
 import logging
 import unicodedata
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el json de la stdlib
+    orjson = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # selectolax es opcional: sin él se extrae con JS en la página
+    HTMLParser = None
 
 # ─── Configuración (desde team_config.json) ─────────────────────────────────
 
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_FILE = SCRIPT_DIR / "team_config.json"
 
+def loads_json(path: Path):
+    """Parsea un fichero JSON directamente desde bytes. orjson (C) si está instalado."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    # json.loads acepta bytes UTF-8: se ahorra el read_text + decode aparte
+    return json.loads(path.read_bytes())
+
+
 def cargar_config() -> dict:
     if not CONFIG_FILE.exists():
         raise FileNotFoundError(
             f"No se encontró {CONFIG_FILE}. "
             "Copia team_config.example.json → team_config.json y ajústalo a tu equipo."
         )
-    return json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+    return loads_json(CONFIG_FILE)
 
 _CFG = cargar_config()
 TEAM_NAME = _CFG["team_name"]
@@ -68,13 +92,18 @@ SEL_GRUPO = f"select[name='{DDL_GRUPOS}']"
 
 DATA_BASE_DIR = SCRIPT_DIR / "src" / "data"
 
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:122.0) Gecko/20100101 Firefox/122.0",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36 Edg/121.0.0.0",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-]
+# UA fijo: la clearance de Cloudflare queda ligada al user-agent, así que
+# rotarlo invalidaría la cookie persistida en cf_state.json entre ejecuciones
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36")
+
+# Client hints a juego con USER_AGENT: en headless Chromium anunciaría la
+# marca "HeadlessChrome" en sec-ch-ua y delataría el modo ante Cloudflare
+CLIENT_HINTS = {
+    "sec-ch-ua": '"Not A(Brand";v="99", "Google Chrome";v="121", "Chromium";v="121"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+}
 
 # ─── Logging ─────────────────────────────────────────────────────────────────
 
@@ -94,17 +123,26 @@ logger = logging.getLogger(__name__)
 
 # ─── Utilidades ──────────────────────────────────────────────────────────────
 
+# Patrones compilados una vez: slugify corre 2× por partido y una vez por
+# fichero de equipo, así que el trabajo repetido de re.sub se nota.
+_RE_NON_WORD = re.compile(r"[^\w\s-]")
+_RE_DASH_SPACE = re.compile(r"[-\s]+")
+_RE_WS = re.compile(r"\s+")
+_RE_WS_SINGLE = re.compile(r"\s")
+
+
+@functools.lru_cache(maxsize=4096)
 def slugify(text: str) -> str:
     text = unicodedata.normalize("NFD", text)
     text = text.encode("ascii", "ignore").decode("ascii")
-    text = re.sub(r"[^\w\s-]", "", text).strip().lower()
-    text = re.sub(r"[-\s]+", "-", text)
+    text = _RE_NON_WORD.sub("", text).strip().lower()
+    text = _RE_DASH_SPACE.sub("-", text)
     return text
 
 
 def normalizar_carpeta(nombre: str) -> str:
-    nombre = re.sub(r"\s+", " ", nombre).strip()
-    nombre = re.sub(r"\s", "-", nombre)
+    nombre = _RE_WS.sub(" ", nombre).strip()
+    nombre = _RE_WS_SINGLE.sub("-", nombre)
     # Eliminar puntos finales (invalido en Windows y problematico para git)
     nombre = nombre.rstrip(".")
     return nombre
@@ -114,23 +152,82 @@ def generar_id(fecha: str, local: str, visitante: str, categoria: str) -> str:
     return slugify(f"{fecha}_{local}_{visitante}_{categoria}")
 
 
-def _fecha_sort(f: str) -> str:
-    try:
-        p = f.split("/")
-        return f"{p[2]}{p[1]}{p[0]}" if len(p) == 3 else "00000000"
-    except Exception:
-        return "00000000"
+@functools.lru_cache(maxsize=1024)
+def _fecha_sort(f: str) -> int:
+    # Clave de orden AAAAMMDD por slicing directo de "DD/MM/AAAA"; solo se usa
+    # como fallback para registros antiguos sin fecha_epoch precalculado.
+    if len(f) == 10 and f[2] == "/" and f[5] == "/":
+        try:
+            return int(f[6:10] + f[3:5] + f[0:2])
+        except ValueError:
+            return 0
+    return 0
+
+
+def dumps_json(data) -> bytes:
+    """Serializa a bytes UTF-8 con indentación. orjson (C) si está instalado."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+# Tras resolver el primer challenge de Cloudflare las pausas "humanas"
+# largas dejan de aportar nada: se encogen a un rango mínimo.
+_CF_RESUELTO = False
+
+# Estado de sesión (cookies cf_clearance) persistido entre ejecuciones: con
+# la cookie válida CF acepta la sesión sin volver a lanzar el challenge.
+CF_STATE_FILE = SCRIPT_DIR / "cf_state.json"
+
+
+async def _guardar_estado_cf(page):
+    global _CF_RESUELTO
+    if not _CF_RESUELTO:
+        try:
+            await page.context.storage_state(path=str(CF_STATE_FILE))
+        except Exception:
+            pass
+    _CF_RESUELTO = True
 
 
 async def pausa(lo: float = 0.8, hi: float = 2.5):
+    if _CF_RESUELTO:
+        lo, hi = 0.1, 0.4
     await asyncio.sleep(random.uniform(lo, hi))
 
 
 # ─── Browser helpers ─────────────────────────────────────────────────────────
 
-async def crear_browser(headless: bool = False):
+# Competiciones scrapeadas en paralelo (un BrowserContext por worker)
+MAX_PARALLEL = 3
+
+# El scraper solo lee HTML: imágenes, fuentes, media y CSS son peso muerto
+# en cada goto/postback y se abortan en la capa de routing.
+_TIPOS_BLOQUEADOS = {"image", "font", "media", "stylesheet"}
+
+# Terceros de analítica/publicidad que la página arrastra y que aquí solo
+# cuestan bytes y handshakes
+_HOSTS_BLOQUEADOS = ("google-analytics.com", "googletagmanager.com",
+                     "doubleclick.net", "facebook.net")
+
+
+async def _bloquear_recursos(route):
+    req = route.request
+    # Los assets del challenge de Cloudflare (/cdn-cgi/) se dejan pasar
+    if req.resource_type in _TIPOS_BLOQUEADOS and "/cdn-cgi/" not in req.url:
+        await route.abort()
+        return
+    # Comparar contra el host real de la URL, no contra la URL completa:
+    # evita falsos positivos con dominios que aparezcan en la query string
+    host = urlsplit(req.url).hostname or ""
+    if host.endswith(_HOSTS_BLOQUEADOS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def crear_browser(headless: bool = True):
+    """Lanza Playwright + Chromium una sola vez. Los contextos se crean aparte."""
     from playwright.async_api import async_playwright
-    from playwright_stealth import Stealth
 
     pw = await async_playwright().start()
     browser = await pw.chromium.launch(
@@ -142,19 +239,33 @@ async def crear_browser(headless: bool = False):
             "--disable-dev-shm-usage",
         ],
     )
+    return pw, browser
+
+
+async def crear_context(browser):
+    """Crea un BrowserContext aislado con stealth aplicado y una página lista."""
+    from playwright_stealth import Stealth
+
     stealth = Stealth()
     context = await browser.new_context(
-        user_agent=random.choice(USER_AGENTS),
+        user_agent=USER_AGENT,
         viewport={"width": 1366, "height": 768},
         locale="es-ES",
         timezone_id="Europe/Madrid",
         extra_http_headers={
             "Accept-Language": "es-ES,es;q=0.9,en-US;q=0.8,en;q=0.7",
+            **CLIENT_HINTS,
         },
+        # Reutilizar la clearance de CF de una ejecución anterior si existe
+        storage_state=str(CF_STATE_FILE) if CF_STATE_FILE.exists() else None,
     )
     await stealth.apply_stealth_async(context)
+    await context.route("**/*", _bloquear_recursos)
+    # Registrar el extractor una sola vez: cada documento nuevo lo expone
+    # como window.__extraerPartidos sin re-transmitir el blob por llamada
+    await context.add_init_script(f"window.__extraerPartidos = {JS_EXTRAER_PARTIDOS};")
     page = await context.new_page()
-    return pw, browser, context, page
+    return context, page
 
 
 async def esperar_pagina(page, timeout: int = 60000) -> bool:
@@ -162,6 +273,7 @@ async def esperar_pagina(page, timeout: int = 60000) -> bool:
     try:
         await page.wait_for_selector(SEL_CAT, timeout=timeout, state="visible")
         await asyncio.sleep(0.5)  # Pequeña pausa adicional para asegurar estabilidad
+        await _guardar_estado_cf(page)
         return True
     except Exception:
         try:
@@ -171,20 +283,40 @@ async def esperar_pagina(page, timeout: int = 60000) -> bool:
                 try:
                     await page.wait_for_selector(SEL_CAT, timeout=120000, state="visible")
                     await asyncio.sleep(1.0)  # Pausa adicional tras resolver CF
+                    await _guardar_estado_cf(page)
                     return True
                 except Exception:
                     logger.error("  ❌ CF challenge no se resolvió")
+                    # La clearance persistida ya no vale: invalidarla para
+                    # que la próxima ejecución arranque con sesión limpia
+                    CF_STATE_FILE.unlink(missing_ok=True)
                     return False
         except Exception:
             pass
         return False
 
 
-async def obtener_opciones(page, selector: str) -> list[dict]:
-    """Lee las opciones de un <select> en la página."""
-    return await page.eval_on_selector_all(
-        selector + " option",
-        "opts => opts.map(o => ({value: o.value, text: o.textContent.trim().replace(/\\s+/g, ' ')}))",
+# Un único page.evaluate lee los tres <select> de golpe: cada llamada
+# Playwright es un viaje por el websocket, y con cientos de grupos los
+# round-trips sueltos pesan más que el propio trabajo DOM.
+JS_SNAPSHOT_DROPDOWNS = """
+(sels) => {
+    const leer = (sel) => Array.from(document.querySelectorAll(sel + ' option'))
+        .map(o => ({value: o.value, text: o.textContent.trim().replace(/\\s+/g, ' ')}));
+    return {
+        categorias: leer(sels.cat),
+        fases: leer(sels.fase),
+        grupos: leer(sels.grupo),
+    };
+}
+"""
+
+
+async def snapshot_dropdowns(page) -> dict:
+    """Lee las opciones de los tres dropdowns en un único viaje al navegador."""
+    return await page.evaluate(
+        JS_SNAPSHOT_DROPDOWNS,
+        {"cat": SEL_CAT, "fase": SEL_FASE, "grupo": SEL_GRUPO},
     )
 
 
@@ -201,16 +333,21 @@ async def seleccionar_dropdown(page, selector: str, ddl_name: str, value: str, m
             try:
                 async with page.expect_navigation(wait_until="load", timeout=90000):
                     await page.select_option(selector, value)
-                await asyncio.sleep(1.0)
             except Exception as nav_error:
                 # La navegación puede fallar si es muy rápida o no hay cambio real
                 logger.debug(f"  Navigation event timeout (puede ser normal): {nav_error}")
-                await asyncio.sleep(2.0)
-            
+
+            # Espera dirigida por evento en lugar de sleep fijo: vuelve en
+            # cuanto el DOM del postback está disponible
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=30000)
+            except Exception:
+                pass
+
             # Verificar que la página esté lista
             ok = await esperar_pagina(page, timeout=90000)
             if ok:
-                await pausa(1.5, 3.0)  # Pausa más larga para estabilidad
+                await pausa(1.5, 3.0)  # Se encoge sola tras resolver el challenge
                 return True
             
             if intento < max_retries - 1:
@@ -231,11 +368,72 @@ async def seleccionar_dropdown(page, selector: str, ddl_name: str, value: str, m
     return False
 
 
+# ─── Postback directo por HTTP ───────────────────────────────────────────────
+
+# Serializa el formulario ASP.NET completo (VIEWSTATE, EVENTVALIDATION y el
+# valor actual de cada campo) para poder replicar un __doPostBack por HTTP.
+JS_FORM_STATE = """
+() => {
+    const form = document.forms[0];
+    if (!form) return {};
+    const campos = {};
+    new FormData(form).forEach((v, k) => { campos[k] = v; });
+    return campos;
+}
+"""
+
+
+async def postback_http(page, url: str, ddl_name: str, value: str,
+                        cargar_en_pagina: bool = True) -> Optional[str]:
+    """Replica el postback de un dropdown con un POST directo al servidor.
+
+    Usa el APIRequestContext del contexto (comparte las cookies de CF ya
+    calentadas). Con cargar_en_pagina la respuesta se monta con set_content,
+    de modo que la extracción JS existente sigue funcionando sobre el DOM;
+    si no, se devuelve el HTML crudo para parsearlo en Python. Se ahorra el
+    render completo + re-inyección de stealth de cada navegación.
+    Devuelve el HTML de la respuesta, o None si el postback no sirvió.
+    """
+    campos = await page.evaluate(JS_FORM_STATE)
+    if "__VIEWSTATE" not in campos:
+        return None
+
+    campos["__EVENTTARGET"] = ddl_name
+    campos["__EVENTARGUMENT"] = ""
+    campos[ddl_name] = value
+
+    resp = await page.context.request.post(url, form=campos)
+    if not resp.ok:
+        logger.debug(f"  Postback HTTP {resp.status} para {ddl_name}")
+        return None
+
+    html = await resp.text()
+    # La respuesta debe traer los dropdowns; si no, era un challenge/error
+    if "DDLCategorias" not in html:
+        return None
+    if cargar_en_pagina:
+        await page.set_content(html, wait_until="domcontentloaded")
+    return html
+
+
+async def cambiar_dropdown(page, url: str, selector: str, ddl_name: str, value: str,
+                           max_retries: int = 2) -> bool:
+    """Cambia un dropdown: primero por POST directo, con la navegación
+    completa de seleccionar_dropdown como fallback."""
+    try:
+        if await postback_http(page, url, ddl_name, value):
+            return True
+    except Exception as e:
+        logger.debug(f"  Postback HTTP falló ({ddl_name}): {e}")
+    return await seleccionar_dropdown(page, selector, ddl_name, value, max_retries=max_retries)
+
+
 # ─── Extracción de partidos ──────────────────────────────────────────────────
 
-async def extraer_partidos(page, categoria: str, fase: str, grupo: str, competicion_nombre: str = "") -> list[dict]:
-    """Extrae todos los partidos del calendario visible."""
-    return await page.evaluate("""
+# Fuente JS del extractor. Se registra una sola vez por contexto con
+# add_init_script (window.__extraerPartidos): así cada llamada viaja como
+# una invocación corta en lugar de re-transmitir y re-parsear todo el blob.
+JS_EXTRAER_PARTIDOS = """
         (params) => {
             const { categoria, fase, grupo, competicion } = params;
             const resultados = [];
@@ -279,10 +477,20 @@ async def extraer_partidos(page, categoria: str, fase: str, grupo: str, competic
                     const ml = ptL && !isNaN(parseInt(ptL)) ? parseInt(ptL) : null;
                     const mv = ptV && !isNaN(parseInt(ptV)) ? parseInt(ptV) : null;
 
+                    // Clave entera AAAAMMDD: ordenar por entero evita
+                    // re-parsear la fecha en cada comparación posterior
+                    let fechaEpoch = 0;
+                    const fm = fecha.match(/^(\\d{2})\\/(\\d{2})\\/(\\d{4})$/);
+                    if (fm) fechaEpoch = parseInt(fm[3]) * 10000 + parseInt(fm[2]) * 100 + parseInt(fm[1]);
+
                     resultados.push({
                         local, visitante,
                         marcador_local: ml, marcador_visitante: mv,
                         fecha, hora, pabellon,
+                        fecha_epoch: fechaEpoch,
+                        // Ordinal del recorrido DOM: el calendario ya viene en
+                        // orden de jornada, así que sirve como clave de orden
+                        orden: resultados.length,
                         es_resultado: ml !== null && mv !== null,
                         jornada: jornadaText,
                         categoria_completa: `${categoria} - ${fase} - ${grupo}`,
@@ -293,12 +501,100 @@ async def extraer_partidos(page, categoria: str, fase: str, grupo: str, competic
 
             return resultados;
         }
-    """, {
+"""
+
+
+async def extraer_partidos(page, categoria: str, fase: str, grupo: str, competicion_nombre: str = "") -> list[dict]:
+    """Extrae todos los partidos del calendario visible."""
+    params = {
         "categoria": categoria,
         "fase": fase,
         "grupo": grupo,
         "competicion": competicion_nombre,
-    })
+    }
+    partidos = await page.evaluate(
+        "(p) => window.__extraerPartidos ? window.__extraerPartidos(p) : null", params
+    )
+    if partidos is None:
+        # Documento sin el init script (p.ej. contexto antiguo): enviar el blob
+        partidos = await page.evaluate(JS_EXTRAER_PARTIDOS, params)
+    return partidos
+
+
+_RE_BR = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_RE_TAGS = re.compile(r"<[^>]+>")
+_RE_FECHA = re.compile(r"^(\d{2})/(\d{2})/(\d{4})$")
+
+
+def extraer_partidos_html(html: str, categoria: str, fase: str, grupo: str,
+                          competicion_nombre: str = "") -> list[dict]:
+    """Versión Python de extraer_partidos sobre el HTML crudo de un postback.
+
+    Parsear con selectolax (MyHTML en C) la respuesta del POST directo evita
+    montarla en el navegador con set_content solo para volver a leerla por JS.
+    Mismos campos de salida que la extracción JS.
+    """
+    resultados: list[dict] = []
+    cal = HTMLParser(html).css_first("#calendario")
+    if cal is None:
+        return resultados
+
+    for header in cal.css("header.nombre_tabla"):
+        h5 = header.css_first("h5")
+        jornada = _RE_WS.sub(" ", h5.text().strip()) if h5 else ""
+
+        tc = header.next
+        while tc is not None:
+            clases = tc.attributes.get("class") if tc.attributes else None
+            if clases and "table-responsive" in clases:
+                break
+            tc = tc.next
+        if tc is None:
+            continue
+        tabla = tc.css_first("table")
+        if tabla is None:
+            continue
+
+        for fila in tabla.css("tbody tr"):
+            c = fila.css("td")
+            if len(c) < 6:
+                continue
+
+            local = c[0].text().strip()
+            pt_l = c[1].text().strip()
+            pt_v = c[2].text().strip()
+            visitante = c[3].text().strip()
+            if not local or not visitante:
+                continue
+
+            strong = c[4].css_first("strong")
+            fecha, hora = "", ""
+            if strong is not None:
+                partes = _RE_BR.split(strong.html or "")
+                fecha = _RE_TAGS.sub("", partes[0]).replace('"', "").strip()
+                if len(partes) > 1:
+                    hora = _RE_TAGS.sub("", partes[1]).replace('"', "").strip()
+
+            pabellon = c[5].text().strip()
+            ml = int(pt_l) if pt_l.lstrip("-").isdigit() else None
+            mv = int(pt_v) if pt_v.lstrip("-").isdigit() else None
+
+            m = _RE_FECHA.match(fecha)
+            fecha_epoch = int(m.group(3)) * 10000 + int(m.group(2)) * 100 + int(m.group(1)) if m else 0
+
+            resultados.append({
+                "local": local, "visitante": visitante,
+                "marcador_local": ml, "marcador_visitante": mv,
+                "fecha": fecha, "hora": hora, "pabellon": pabellon,
+                "fecha_epoch": fecha_epoch,
+                "orden": len(resultados),
+                "es_resultado": ml is not None and mv is not None,
+                "jornada": jornada,
+                "categoria_completa": f"{categoria} - {fase} - {grupo}",
+                "fase": fase, "grupo": grupo, "competicion": competicion_nombre,
+            })
+
+    return resultados
 
 
 # ─── Agrupación y clasificación ──────────────────────────────────────────────
@@ -309,31 +605,57 @@ def agrupar_por_equipo(partidos: list[dict]) -> dict[str, list[dict]]:
         loc, vis = p["local"], p["visitante"]
         if "DESCANSA" in loc or "DESCANSA" in vis:
             continue
+        # El id es idéntico para ambas vistas del partido: calcularlo una vez
+        pid = generar_id(p["fecha"], loc, vis, p["categoria_completa"])
         base = {
             "competicion": p["competicion"],
+            "categoria": p["categoria_completa"],
             "marcador_local": p["marcador_local"],
             "marcador_visitante": p["marcador_visitante"],
             "fecha": p["fecha"], "hora": p["hora"],
+            "fecha_epoch": p.get("fecha_epoch", 0),
+            "orden": p.get("orden", 0),
             "pabellon": p["pabellon"],
             "es_resultado": p["es_resultado"],
             "estado": "finalizado" if p["es_resultado"] else "proximo",
             "jornada": p["jornada"],
+            "id": pid,
         }
         equipos.setdefault(loc, []).append({
-            **base, "categoria": p["categoria_completa"],
-            "equipo": loc, "rival": vis, "ubicacion": "Local",
-            "id": generar_id(p["fecha"], loc, vis, p["categoria_completa"]),
+            **base, "equipo": loc, "rival": vis, "ubicacion": "Local",
         })
         equipos.setdefault(vis, []).append({
-            **base, "categoria": p["categoria_completa"],
-            "equipo": vis, "rival": loc, "ubicacion": "Visitante",
-            "id": generar_id(p["fecha"], loc, vis, p["categoria_completa"]),
+            **base, "equipo": vis, "rival": loc, "ubicacion": "Visitante",
         })
     return equipos
 
 
+@dataclass(slots=True)
+class TeamStats:
+    """Contadores de clasificación de un equipo (layout plano de atributos)."""
+    equipo: str
+    pj: int = 0   # partidos jugados
+    pg: int = 0   # ganados
+    pp: int = 0   # perdidos
+    pf: int = 0   # puntos a favor
+    pc: int = 0   # puntos en contra
+    pts: int = 0  # puntos de clasificación
+
+
 def calcular_clasificacion(partidos: list[dict], cat: str, fase: str, grupo: str, competicion_nombre: str = "") -> dict:
-    stats: dict[str, dict] = {}
+    # Lista plana de TeamStats (slots) + índice por nombre: los incrementos
+    # son accesos a atributo sobre structs pequeños en vez de dobles lookups
+    # en un dict de dicts; los dicts JSON se construyen una vez al final.
+    indices: dict[str, int] = {}
+    stats: list[TeamStats] = []
+
+    def obtener(equipo: str) -> TeamStats:
+        i = indices.get(equipo)
+        if i is None:
+            i = indices[equipo] = len(stats)
+            stats.append(TeamStats(equipo))
+        return stats[i]
+
     for p in partidos:
         if not p["es_resultado"]:
             continue
@@ -344,33 +666,32 @@ def calcular_clasificacion(partidos: list[dict], cat: str, fase: str, grupo: str
         if ml is None or mv is None:
             continue
 
-        for eq in (loc, vis):
-            if eq not in stats:
-                stats[eq] = {"equipo": eq, "partidos_jugados": 0, "partidos_ganados": 0,
-                             "partidos_perdidos": 0, "puntos_favor": 0, "puntos_contra": 0,
-                             "diferencia": 0, "puntos": 0}
-
-        stats[loc]["partidos_jugados"] += 1
-        stats[loc]["puntos_favor"] += ml
-        stats[loc]["puntos_contra"] += mv
-        stats[vis]["partidos_jugados"] += 1
-        stats[vis]["puntos_favor"] += mv
-        stats[vis]["puntos_contra"] += ml
+        s_loc = obtener(loc)
+        s_vis = obtener(vis)
+        s_loc.pj += 1
+        s_loc.pf += ml
+        s_loc.pc += mv
+        s_vis.pj += 1
+        s_vis.pf += mv
+        s_vis.pc += ml
 
         if ml > mv:
-            stats[loc]["partidos_ganados"] += 1
-            stats[loc]["puntos"] += 2
-            stats[vis]["partidos_perdidos"] += 1
-            stats[vis]["puntos"] += 1
+            s_loc.pg += 1
+            s_loc.pts += 2
+            s_vis.pp += 1
+            s_vis.pts += 1
         elif mv > ml:
-            stats[vis]["partidos_ganados"] += 1
-            stats[vis]["puntos"] += 2
-            stats[loc]["partidos_perdidos"] += 1
-            stats[loc]["puntos"] += 1
-
-    clasificacion = list(stats.values())
-    for eq in clasificacion:
-        eq["diferencia"] = eq["puntos_favor"] - eq["puntos_contra"]
+            s_vis.pg += 1
+            s_vis.pts += 2
+            s_loc.pp += 1
+            s_loc.pts += 1
+
+    clasificacion = [
+        {"equipo": s.equipo, "partidos_jugados": s.pj, "partidos_ganados": s.pg,
+         "partidos_perdidos": s.pp, "puntos_favor": s.pf, "puntos_contra": s.pc,
+         "diferencia": s.pf - s.pc, "puntos": s.pts}
+        for s in stats
+    ]
     clasificacion.sort(key=lambda x: (-x["puntos"], -x["diferencia"], -x["puntos_favor"]))
     for i, eq in enumerate(clasificacion, 1):
         eq["posicion"] = i
@@ -385,20 +706,93 @@ def calcular_clasificacion(partidos: list[dict], cat: str, fase: str, grupo: str
 
 # ─── Guardado ────────────────────────────────────────────────────────────────
 
-def guardar(por_equipo: dict, clasif: dict, cat: str, grupo: str, fase: str, data_dir: Path = None):
+def _hash_payload(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def escribir_si_cambia(path: Path, payload: bytes) -> bool:
+    """Escribe solo si el contenido difiere del fichero existente.
+
+    Evita reescrituras idénticas en modo --watch entre jornadas, que solo
+    generan I/O y churn de git/CI. El swap con os.replace hace la escritura
+    atómica: un corte a mitad no deja un JSON a medias que envenene la
+    siguiente pasada. Devuelve True si se escribió.
+    """
+    if path.exists() and _hash_payload(payload) == _hash_payload(path.read_bytes()):
+        return False
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+    return True
+
+
+async def guardar(por_equipo: dict, clasif: dict, cat: str, grupo: str, fase: str, data_dir: Path = None):
     d = data_dir / normalizar_carpeta(cat) / normalizar_carpeta(grupo) / normalizar_carpeta(fase)
     d.mkdir(parents=True, exist_ok=True)
 
+    # Serializar primero (CPU puro), despachar las escrituras en paralelo:
+    # decenas de JSONs pequeños por grupo salen mejor en hilos que en serie.
+    trabajos: list[tuple[Path, bytes, str]] = []
     for equipo, partidos in por_equipo.items():
         fn = slugify(equipo) + ".json"
-        partidos.sort(key=lambda x: _fecha_sort(x.get("fecha", "")), reverse=True)
-        (d / fn).write_text(json.dumps(partidos, ensure_ascii=False, indent=2), encoding="utf-8")
-        logger.info(f"      ✅ {fn}: {len(partidos)} partidos")
-
-    (d / "clasificacion.json").write_text(
-        json.dumps(clasif, ensure_ascii=False, indent=2), encoding="utf-8"
+        # El ordinal DOM ya es cronológico (recorrido por jornadas): ordenar
+        # por él evita evaluar la clave de fecha por elemento y por equipo
+        if all("orden" in x for x in partidos):
+            partidos.sort(key=itemgetter("orden"), reverse=True)
+        else:
+            partidos.sort(key=lambda x: x.get("fecha_epoch") or _fecha_sort(x.get("fecha", "")),
+                          reverse=True)
+        trabajos.append((d / fn, dumps_json(partidos), f"✅ {fn}: {len(partidos)} partidos"))
+    trabajos.append((d / "clasificacion.json", dumps_json(clasif),
+                     f"📊 clasificacion.json: {len(clasif.get('clasificacion', []))} equipos"))
+
+    escritos = await asyncio.gather(
+        *(asyncio.to_thread(escribir_si_cambia, path, payload)
+          for path, payload, _ in trabajos)
     )
-    logger.info(f"      📊 clasificacion.json: {len(clasif.get('clasificacion', []))} equipos")
+    for (path, _, msg), escrito in zip(trabajos, escritos):
+        if escrito:
+            logger.info(f"      {msg}")
+        else:
+            logger.info(f"      ⏭️ {path.name}: sin cambios")
+
+
+# ─── Índice de partidos del equipo ──────────────────────────────────────────
+
+# fecha → partidos pendientes del equipo, alimentado durante el scrape para
+# que generar_partidos_hoy no tenga que re-escanear todo src/data en disco.
+_INDICE_PARTIDOS: dict[str, list[dict]] = {}
+
+PARTIDOS_INDEX_FILE = SCRIPT_DIR / "partidos_index.json"
+
+
+def indexar_partidos_equipo(por_equipo: dict, comp_carpeta: str, cat: str, grupo: str, fase: str):
+    """Registra en el índice los partidos sin resultado del equipo (TEAM_SLUG)."""
+    cat_c = normalizar_carpeta(cat)
+    grupo_c = normalizar_carpeta(grupo)
+    fase_c = normalizar_carpeta(fase)
+    for equipo, partidos in por_equipo.items():
+        slug = slugify(equipo)
+        if not slug.startswith(TEAM_SLUG):
+            continue
+        rel = f"{comp_carpeta}/{cat_c}/{grupo_c}/{fase_c}/{slug}.json"
+        for p in partidos:
+            if p.get("es_resultado"):
+                continue
+            _INDICE_PARTIDOS.setdefault(p.get("fecha", ""), []).append({
+                "equipo": p.get("equipo", ""),
+                "rival": p.get("rival", ""),
+                "fecha": p.get("fecha", ""),
+                "hora": p.get("hora", ""),
+                "categoria": p.get("categoria", ""),
+                "ubicacion": p.get("ubicacion", ""),
+                "id": p.get("id", ""),
+                "comp_carpeta": comp_carpeta,
+                "cat_carpeta": cat_c,
+                "grupo_carpeta": grupo_c,
+                "fase_carpeta": fase_c,
+                "json_path": rel,
+            })
 
 
 # ─── Nombre de competición desde la página ──────────────────────────────────
@@ -426,9 +820,9 @@ async def obtener_nombre_competicion(page) -> str:
 
 def carpeta_competicion(nombre: str) -> str:
     """Convierte nombre de competición a nombre de carpeta."""
-    nombre = re.sub(r"\s+", " ", nombre).strip()
+    nombre = _RE_WS.sub(" ", nombre).strip()
     # Capitalizar palabras, reemplazar espacios por guiones
-    nombre = re.sub(r"\s", "-", nombre)
+    nombre = _RE_WS_SINGLE.sub("-", nombre)
     # Eliminar puntos finales (invalido en Windows y problematico para git)
     nombre = nombre.rstrip(".")
     return nombre
@@ -436,6 +830,88 @@ def carpeta_competicion(nombre: str) -> str:
 
 # ─── Scraper de una competición ──────────────────────────────────────────────
 
+# Páginas simultáneas por competición (pestañas dentro del mismo contexto)
+MAX_PAGINAS_GRUPO = 3
+
+
+async def procesar_grupo(
+    page, url: str, cat: dict, fase: dict, grupo: dict,
+    comp_nombre: str, data_dir: Path,
+) -> tuple[int, int]:
+    """Scrapea un (categoría, fase, grupo) concreto en su propia página.
+
+    Navega desde cero y repite los tres postbacks: cada página mantiene su
+    propio estado ASP.NET, así que los workers no se pisan entre sí.
+    Devuelve (partidos, archivos).
+    """
+    logger.info(f"    🏷️  {cat['text']} / {fase['text']} / {grupo['text']}")
+
+    await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+    if not await esperar_pagina(page, timeout=60000):
+        logger.error(f"      ❌ No se pudo cargar la página para {grupo['text']}")
+        return 0, 0
+    await pausa(1.0, 2.0)
+
+    for selector, ddl_name, value, retries in (
+        (SEL_CAT, DDL_CATEGORIAS, cat["value"], 3),
+        (SEL_FASE, DDL_FASES, fase["value"], 2),
+    ):
+        if not await cambiar_dropdown(page, url, selector, ddl_name, value, max_retries=retries):
+            logger.warning(f"      ⚠️ Postback fallido ({ddl_name}) en {grupo['text']}")
+            return 0, 0
+
+    # Último postback (grupo): si hay parser C disponible, el HTML del POST
+    # se parsea directamente en Python sin montarlo en el navegador
+    partidos = None
+    if HTMLParser is not None:
+        try:
+            html = await postback_http(page, url, DDL_GRUPOS, grupo["value"],
+                                       cargar_en_pagina=False)
+            if html:
+                partidos = extraer_partidos_html(
+                    html, cat["text"], fase["text"], grupo["text"], comp_nombre
+                )
+        except Exception as e:
+            logger.debug(f"      Parse HTTP del grupo falló, fallback a navegador: {e}")
+
+    if partidos is None:
+        if not await cambiar_dropdown(page, url, SEL_GRUPO, DDL_GRUPOS, grupo["value"], max_retries=2):
+            logger.warning(f"      ⚠️ Postback fallido ({DDL_GRUPOS}) en {grupo['text']}")
+            return 0, 0
+
+        # Asegurar tab CALENDARIO activo
+        try:
+            cal_tab = page.locator("#calendario-tab")
+            if await cal_tab.count() > 0:
+                aria = await cal_tab.get_attribute("aria-selected")
+                if aria != "true":
+                    await cal_tab.click()
+                    await pausa(0.5, 1.0)
+        except Exception:
+            pass
+
+        # Extraer partidos
+        partidos = await extraer_partidos(
+            page, cat["text"], fase["text"], grupo["text"], comp_nombre
+        )
+    if not partidos:
+        logger.warning(f"      ⚠️ Sin partidos en {grupo['text']}")
+        return 0, 0
+
+    logger.info(f"      📊 {len(partidos)} partidos")
+
+    # Agrupar + clasificar + guardar
+    por_equipo = agrupar_por_equipo(partidos)
+    logger.info(f"      👥 {len(por_equipo)} equipos")
+    indexar_partidos_equipo(por_equipo, data_dir.name, cat["text"], grupo["text"], fase["text"])
+
+    clasif = calcular_clasificacion(
+        partidos, cat["text"], fase["text"], grupo["text"], comp_nombre
+    )
+    await guardar(por_equipo, clasif, cat["text"], grupo["text"], fase["text"], data_dir)
+    return len(partidos), len(por_equipo)
+
+
 async def scrape_una_competicion(
     page, url: str, filtro_cat: Optional[str] = None
 ) -> tuple[int, int, str]:
@@ -445,7 +921,7 @@ async def scrape_una_competicion(
     await page.goto(url, wait_until="domcontentloaded", timeout=60000)
     if not await esperar_pagina(page, timeout=60000):
         logger.error("❌ No se pudo cargar la página")
-        return 0, 0
+        return 0, 0, ""
     await pausa(2.0, 4.0)
 
     # Obtener nombre real de la competición
@@ -459,8 +935,8 @@ async def scrape_una_competicion(
     logger.info(f"📂 Carpeta: {comp_carpeta}")
 
     # Leer categorías
-    categorias = await obtener_opciones(page, SEL_CAT)
-    categorias = [c for c in categorias if c["value"]]
+    snap = await snapshot_dropdowns(page)
+    categorias = [c for c in snap["categorias"] if c["value"]]
     logger.info(f"📋 Categorías: {len(categorias)}")
     for c in categorias:
         logger.info(f"   - {c['text']}")
@@ -472,98 +948,91 @@ async def scrape_una_competicion(
     total_partidos = 0
     total_archivos = 0
 
-    for cat_idx, cat in enumerate(categorias):
-        cat_nombre = cat["text"]
-        cat_value = cat["value"]
-
-        if filtro_cat and filtro_cat.lower() not in cat_nombre.lower():
-            continue
-
-        logger.info(f"\n{'─' * 55}")
-        logger.info(f"📂 CATEGORÍA: {cat_nombre}")
+    # Pool de páginas del mismo contexto: los postbacks de cada (fase, grupo)
+    # se solapan entre pestañas. Se reutiliza entre categorías y se cierra al final.
+    paginas: asyncio.Queue = asyncio.Queue()
+    n_paginas = 0
 
-        ok = await seleccionar_dropdown(page, SEL_CAT, DDL_CATEGORIAS, cat_value, max_retries=3)
-        if not ok:
-            logger.error(f"  ❌ No se pudo cambiar a {cat_nombre} tras múltiples intentos")
-            # Esperar antes de continuar con la siguiente categoría
-            await asyncio.sleep(5.0)
-            continue
+    async def procesar_acotado(cat: dict, fase: dict, grupo: dict) -> tuple[int, int]:
+        pg = await paginas.get()
+        try:
+            return await procesar_grupo(pg, url, cat, fase, grupo, comp_nombre, data_dir)
+        finally:
+            paginas.put_nowait(pg)
 
-        # Leer fases
-        fases = await obtener_opciones(page, SEL_FASE)
-        fases = [f for f in fases if f["value"]]
-        logger.info(f"  📑 Fases: {[f['text'] for f in fases]}")
+    try:
+        for cat in categorias:
+            cat_nombre = cat["text"]
 
-        if not fases:
-            logger.warning(f"  ⚠️ Sin fases")
-            continue
+            if filtro_cat and filtro_cat.lower() not in cat_nombre.lower():
+                continue
 
-        for fase_idx, fase in enumerate(fases):
-            fase_nombre = fase["text"]
-            fase_value = fase["value"]
-            logger.info(f"  📄 Fase: {fase_nombre}")
+            logger.info(f"\n{'─' * 55}")
+            logger.info(f"📂 CATEGORÍA: {cat_nombre}")
 
-            ok = await seleccionar_dropdown(page, SEL_FASE, DDL_FASES, fase_value, max_retries=2)
+            # Página sonda: enumerar todas las combinaciones (fase, grupo)
+            ok = await seleccionar_dropdown(page, SEL_CAT, DDL_CATEGORIAS, cat["value"], max_retries=3)
             if not ok:
-                logger.warning(f"    ⚠️ No se pudo cambiar a fase {fase_nombre}")
-                await asyncio.sleep(3.0)
+                logger.error(f"  ❌ No se pudo cambiar a {cat_nombre} tras múltiples intentos")
+                # Esperar antes de continuar con la siguiente categoría
+                await asyncio.sleep(5.0)
                 continue
 
-            # Leer grupos
-            grupos = await obtener_opciones(page, SEL_GRUPO)
-            grupos = [g for g in grupos if g["value"]]
-            logger.info(f"    📁 Grupos: {[g['text'] for g in grupos]}")
+            # Leer fases (y de paso los grupos de la fase activa) en un snapshot
+            snap = await snapshot_dropdowns(page)
+            fases = [f for f in snap["fases"] if f["value"]]
+            logger.info(f"  📑 Fases: {[f['text'] for f in fases]}")
 
-            if not grupos:
-                logger.warning(f"    ⚠️ Sin grupos")
+            if not fases:
+                logger.warning(f"  ⚠️ Sin fases")
                 continue
 
-            for grupo_idx, grupo in enumerate(grupos):
-                grupo_nombre = grupo["text"]
-                grupo_value = grupo["value"]
-                logger.info(f"    🏷️  Grupo: {grupo_nombre}")
-
-                ok = await seleccionar_dropdown(page, SEL_GRUPO, DDL_GRUPOS, grupo_value, max_retries=2)
-                if not ok:
-                    logger.warning(f"      ⚠️ No se pudo cambiar a grupo {grupo_nombre}")
-                    await asyncio.sleep(3.0)
-                    continue
-
-                # Asegurar tab CALENDARIO activo
-                try:
-                    cal_tab = page.locator("#calendario-tab")
-                    if await cal_tab.count() > 0:
-                        aria = await cal_tab.get_attribute("aria-selected")
-                        if aria != "true":
-                            await cal_tab.click()
-                            await pausa(0.5, 1.0)
-                except Exception:
-                    pass
+            combos: list[tuple[dict, dict]] = []
+            for fase_idx, fase in enumerate(fases):
+                if fase_idx == 0:
+                    # Tras el postback de categoría la fase activa ya es la
+                    # primera: sus grupos vienen en el snapshot, sin postback.
+                    grupos = snap["grupos"]
+                else:
+                    ok = await seleccionar_dropdown(page, SEL_FASE, DDL_FASES, fase["value"], max_retries=2)
+                    if not ok:
+                        logger.warning(f"    ⚠️ No se pudo cambiar a fase {fase['text']}")
+                        await asyncio.sleep(3.0)
+                        continue
+                    grupos = (await snapshot_dropdowns(page))["grupos"]
+
+                grupos = [g for g in grupos if g["value"]]
+                logger.info(f"    📁 Grupos de {fase['text']}: {[g['text'] for g in grupos]}")
+                combos.extend((fase, g) for g in grupos)
+
+            if not combos:
+                logger.warning(f"  ⚠️ Sin grupos")
+                continue
 
-                # Extraer partidos
-                partidos = await extraer_partidos(
-                    page, cat_nombre, fase_nombre, grupo_nombre, comp_nombre
-                )
-                if not partidos:
-                    logger.warning(f"      ⚠️ Sin partidos")
+            # Despachar combos al pool de páginas
+            while n_paginas < min(MAX_PAGINAS_GRUPO, len(combos)):
+                paginas.put_nowait(await page.context.new_page())
+                n_paginas += 1
+
+            resultados_cat = await asyncio.gather(
+                *(procesar_acotado(cat, fase, grupo) for fase, grupo in combos),
+                return_exceptions=True,
+            )
+            for res in resultados_cat:
+                if isinstance(res, Exception):
+                    logger.error(f"  ❌ Error en grupo: {res}")
                     continue
+                tp, ta = res
+                total_partidos += tp
+                total_archivos += ta
 
-                logger.info(f"      📊 {len(partidos)} partidos")
-                total_partidos += len(partidos)
-
-                # Agrupar + clasificar + guardar
-                por_equipo = agrupar_por_equipo(partidos)
-                total_archivos += len(por_equipo)
-                logger.info(f"      👥 {len(por_equipo)} equipos")
-
-                clasif = calcular_clasificacion(
-                    partidos, cat_nombre, fase_nombre, grupo_nombre, comp_nombre
-                )
-                guardar(por_equipo, clasif, cat_nombre, grupo_nombre, fase_nombre, data_dir)
-
-                await pausa(0.8, 1.8)
             await pausa(1.0, 2.5)
-        await pausa(2.0, 4.0)
+    finally:
+        while not paginas.empty():
+            try:
+                await paginas.get_nowait().close()
+            except Exception:
+                pass
 
     logger.info(f"\n  ✅ {comp_nombre}: {total_partidos} partidos, {total_archivos} archivos")
     return total_partidos, total_archivos, comp_carpeta
@@ -574,49 +1043,74 @@ async def scrape_una_competicion(
 async def scrape_todas(
     filtro_comp: Optional[str] = None,
     filtro_cat: Optional[str] = None,
-    headless: bool = False,
+    headless: bool = True,
+    browser=None,
 ):
     logger.info("=" * 60)
     logger.info(f"🏀 SCRAPER COMPETICIONES – {TEAM_NAME}")
     logger.info(f"📋 {len(COMPETICIONES)} competiciones registradas")
     logger.info("=" * 60)
 
-    pw, browser, context, page = await crear_browser(headless=headless)
+    # Filtrar por nombre de competición si se especificó
+    urls = []
+    for url in COMPETICIONES:
+        if filtro_comp:
+            slug = url.rstrip("/").split("/")[-1]
+            from urllib.parse import unquote
+            slug_decoded = unquote(slug).lower()
+            if filtro_comp.lower() not in slug_decoded:
+                continue
+        urls.append(url)
 
-    gran_total_partidos = 0
-    gran_total_archivos = 0
-    resultados = []
+    # Si nos pasan un browser (modo --watch) lo reutilizamos: así no se re-paga
+    # el arranque de Chromium ni la resolución de challenges de CF en cada tick.
+    browser_propio = browser is None
+    pw = None
+    if browser_propio:
+        pw, browser = await crear_browser(headless=headless)
 
-    try:
-        for comp_idx, url in enumerate(COMPETICIONES):
-            # Filtrar por nombre de competición si se especificó
-            if filtro_comp:
-                slug = url.rstrip("/").split("/")[-1]
-                from urllib.parse import unquote
-                slug_decoded = unquote(slug).lower()
-                if filtro_comp.lower() not in slug_decoded:
-                    continue
+    # Índice fecha → partidos de la pasada anterior (modo --watch): empezar limpio
+    _INDICE_PARTIDOS.clear()
+
+    semaforo = asyncio.Semaphore(MAX_PARALLEL)
+    resultados: list[tuple] = [None] * len(urls)
 
+    async def worker(idx: int, url: str):
+        """Scrapea una competición en su propio BrowserContext, acotado por el semáforo."""
+        async with semaforo:
             logger.info(f"\n{'═' * 60}")
-            logger.info(f"🏆 [{comp_idx + 1}/{len(COMPETICIONES)}] {url}")
+            logger.info(f"🏆 [{idx + 1}/{len(urls)}] {url}")
             logger.info(f"{'═' * 60}")
-
+            # crear_context dentro del try: si falla (cf_state.json corrupto,
+            # browser desconectado en --watch) la competición queda registrada
+            # como ❌ en vez de desaparecer del resumen y de comp_url_map.json
+            context = None
             try:
+                context, page = await crear_context(browser)
                 tp, ta, comp_carpeta = await scrape_una_competicion(page, url, filtro_cat)
-                gran_total_partidos += tp
-                gran_total_archivos += ta
-                resultados.append((url, tp, ta, "✅", comp_carpeta))
+                resultados[idx] = (url, tp, ta, "✅", comp_carpeta)
             except Exception as e:
                 logger.error(f"❌ Error en competición: {e}", exc_info=True)
-                resultados.append((url, 0, 0, f"❌ {e}", ""))
-                # Renavegar a una página limpia para recuperar
-                try:
-                    await page.goto("about:blank")
-                    await pausa(1.0, 2.0)
-                except Exception:
-                    pass
+                resultados[idx] = (url, 0, 0, f"❌ {e}", "")
+            finally:
+                if context is not None:
+                    await context.close()
 
-            await pausa(3.0, 6.0)
+    try:
+        caidas = await asyncio.gather(*(worker(i, url) for i, url in enumerate(urls)),
+                                      return_exceptions=True)
+        for c in caidas:
+            if isinstance(c, Exception):
+                logger.error(f"❌ Worker caído: {c}", exc_info=c)
+
+        # Una pasada filtrada o con workers caídos deja _INDICE_PARTIDOS
+        # incompleto: generar_partidos_hoy no debe fiarse de él en ese caso
+        pasada_completa = (not filtro_comp and not filtro_cat
+                           and all(r is not None and r[3] == "✅" for r in resultados))
+
+        gran_total_partidos = sum(r[1] for r in resultados if r)
+        gran_total_archivos = sum(r[2] for r in resultados if r)
+        resultados = [r for r in resultados if r]
 
         # Resumen final
         logger.info(f"\n{'═' * 60}")
@@ -634,14 +1128,15 @@ async def scrape_todas(
         logger.error(f"❌ Error crítico: {e}", exc_info=True)
         raise
     finally:
-        await browser.close()
-        await pw.stop()
+        if browser_propio:
+            await browser.close()
+            await pw.stop()
 
     # Generar comp_url_map.json (mapa carpeta → URL para el scraper de resultados)
     generar_comp_url_map(resultados)
 
     # Generar partidos_hoy.json para el disparador de resultados
-    generar_partidos_hoy()
+    generar_partidos_hoy(indice_completo=pasada_completa)
 
 
 def generar_comp_url_map(resultados: list[tuple]):
@@ -654,23 +1149,18 @@ def generar_comp_url_map(resultados: list[tuple]):
         if comp_carpeta:
             url_map[comp_carpeta] = url
     out = SCRIPT_DIR / "comp_url_map.json"
-    out.write_text(json.dumps(url_map, ensure_ascii=False, indent=2), encoding="utf-8")
+    out.write_bytes(dumps_json(url_map))
     logger.info(f"🗺️ comp_url_map.json: {len(url_map)} competiciones mapeadas")
 
 
-def generar_partidos_hoy():
-    """
-    Escanea todos los JSON del equipo (TEAM_SLUG) y genera partidos_hoy.json
-    con los partidos de hoy que aún no tienen resultado.
-    Usado por el workflow disparador para saber cuándo lanzar el scraper de resultados.
-    """
-    hoy = datetime.now().strftime("%d/%m/%Y")
-    partidos_hoy = []
+def _escanear_partidos_equipo() -> dict[str, list[dict]]:
+    """Fallback frío: reconstruye el índice fecha → partidos desde src/data."""
+    indice: dict[str, list[dict]] = {}
     glob_pattern = f"{TEAM_SLUG}*.json"
 
     for json_path in DATA_BASE_DIR.rglob(glob_pattern):
         try:
-            data = json.loads(json_path.read_text(encoding="utf-8"))
+            data = loads_json(json_path)
             if not isinstance(data, list):
                 continue
         except Exception:
@@ -684,75 +1174,132 @@ def generar_partidos_hoy():
         for p in data:
             if p.get("es_resultado"):
                 continue
-            if p.get("fecha") == hoy:
-                partidos_hoy.append({
-                    "equipo": p.get("equipo", ""),
-                    "rival": p.get("rival", ""),
-                    "fecha": p.get("fecha", ""),
-                    "hora": p.get("hora", ""),
-                    "categoria": p.get("categoria", ""),
-                    "ubicacion": p.get("ubicacion", ""),
-                    "id": p.get("id", ""),
-                    "comp_carpeta": parts[0],
-                    "cat_carpeta": parts[1],
-                    "grupo_carpeta": parts[2],
-                    "fase_carpeta": parts[3],
-                    "json_path": str(rel),
-                })
-
-    out = SCRIPT_DIR / "partidos_hoy.json"
-    out.write_text(json.dumps(partidos_hoy, ensure_ascii=False, indent=2), encoding="utf-8")
+            indice.setdefault(p.get("fecha", ""), []).append({
+                "equipo": p.get("equipo", ""),
+                "rival": p.get("rival", ""),
+                "fecha": p.get("fecha", ""),
+                "hora": p.get("hora", ""),
+                "categoria": p.get("categoria", ""),
+                "ubicacion": p.get("ubicacion", ""),
+                "id": p.get("id", ""),
+                "comp_carpeta": parts[0],
+                "cat_carpeta": parts[1],
+                "grupo_carpeta": parts[2],
+                "fase_carpeta": parts[3],
+                "json_path": str(rel),
+            })
+    return indice
+
+
+def generar_partidos_hoy(indice_completo: bool = True):
+    """
+    Genera partidos_hoy.json con los partidos de hoy que aún no tienen resultado.
+    Usa el índice en memoria construido durante el scrape (o partidos_index.json
+    de una pasada anterior); solo re-escanea src/data en frío.
+    Usado por el workflow disparador para saber cuándo lanzar el scraper de resultados.
+
+    Si `indice_completo` es False (pasada filtrada o con fallos), el índice en
+    memoria solo cubre parte de las competiciones: usarlo borraría del estado
+    los partidos de las no scrapeadas, así que se re-escanea src/data, que
+    conserva lo descargado en pasadas anteriores.
+    """
+    hoy = datetime.now().strftime("%d/%m/%Y")
+
+    indice: dict[str, list[dict]] = {}
+    if indice_completo:
+        indice = _INDICE_PARTIDOS
+        if not indice and PARTIDOS_INDEX_FILE.exists():
+            try:
+                indice = loads_json(PARTIDOS_INDEX_FILE)
+            except Exception:
+                indice = {}
+    if not indice:
+        indice = _escanear_partidos_equipo()
+
+    # Persistir el índice para la próxima invocación en frío
+    escribir_si_cambia(PARTIDOS_INDEX_FILE, dumps_json(indice))
+
+    partidos_hoy = indice.get(hoy, [])
+    escribir_si_cambia(SCRIPT_DIR / "partidos_hoy.json", dumps_json(partidos_hoy))
     logger.info(f"📅 partidos_hoy.json: {len(partidos_hoy)} partido(s) hoy ({hoy})")
 
 
 # ─── Modo automático ─────────────────────────────────────────────────────────
 
-async def modo_automatico(headless: bool = False, filtro_comp: Optional[str] = None):
+async def modo_automatico(headless: bool = True, filtro_comp: Optional[str] = None):
     """
     Lun–Vie: cada 2 horas.
     Sáb–Dom 8:00–23:59: cada 30 minutos.
     """
     logger.info("🔄 Modo automático activado")
-    while True:
-        try:
-            await scrape_todas(filtro_comp=filtro_comp, headless=headless)
-        except Exception as e:
-            logger.error(f"❌ Error: {e}")
-
-        ahora = datetime.now()
-        es_finde = ahora.weekday() in (5, 6)
-        if es_finde and 8 <= ahora.hour < 24:
-            intervalo = 30
-        elif es_finde:
-            proxima = ahora.replace(hour=8, minute=0, second=0)
-            if proxima <= ahora:
-                proxima += timedelta(days=1)
-            intervalo = int((proxima - ahora).total_seconds() / 60)
-        else:
-            intervalo = 120
 
-        logger.info(f"⏰ Próxima ejecución en {intervalo} min")
-        await asyncio.sleep(intervalo * 60)
+    # Browser compartido entre ticks: cada pasada crea contextos frescos
+    # (storage limpio) pero Chromium y las cookies de CF siguen calientes.
+    pw, browser = await crear_browser(headless=headless)
+    try:
+        while True:
+            # Chequeo de salud: si Chromium murió entre pasadas (crash, OOM),
+            # se relanza en vez de dejar el bucle fallando hasta el reinicio
+            if not browser.is_connected():
+                logger.warning("Chromium desconectado; relanzando navegador")
+                try:
+                    await browser.close()
+                    await pw.stop()
+                except Exception:
+                    pass
+                pw, browser = await crear_browser(headless=headless)
+            try:
+                await scrape_todas(filtro_comp=filtro_comp, headless=headless, browser=browser)
+            except Exception as e:
+                logger.error(f"❌ Error: {e}")
+
+            ahora = datetime.now()
+            es_finde = ahora.weekday() in (5, 6)
+            if es_finde and 8 <= ahora.hour < 24:
+                intervalo = 30
+            elif es_finde:
+                proxima = ahora.replace(hour=8, minute=0, second=0)
+                if proxima <= ahora:
+                    proxima += timedelta(days=1)
+                intervalo = int((proxima - ahora).total_seconds() / 60)
+            else:
+                intervalo = 120
+
+            logger.info(f"⏰ Próxima ejecución en {intervalo} min")
+            await asyncio.sleep(intervalo * 60)
+    finally:
+        await browser.close()
+        await pw.stop()
 
 
 # ─── CLI ─────────────────────────────────────────────────────────────────────
 
 def main():
+    # uvloop reduce el overhead de scheduling de los muchos awaits cortos;
+    # solo existe en POSIX (en Windows se mantiene el loop estándar)
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+
     parser = argparse.ArgumentParser(description="Scraper Baloncesto Cádiz")
     parser.add_argument("--watch", action="store_true", help="Modo automático")
     parser.add_argument("--competicion", type=str, default=None,
                         help="Filtrar por nombre de competición (busca en el slug de la URL)")
     parser.add_argument("--categoria", type=str, default=None, help="Filtrar categoría")
-    parser.add_argument("--headless", action="store_true", help="Modo headless (puede fallar con CF)")
+    parser.add_argument("--headed", action="store_true",
+                        help="Abrir el navegador visible (depuración; por defecto headless)")
     args = parser.parse_args()
 
     if args.watch:
-        asyncio.run(modo_automatico(headless=args.headless, filtro_comp=args.competicion))
+        asyncio.run(modo_automatico(headless=not args.headed, filtro_comp=args.competicion))
     else:
         asyncio.run(scrape_todas(
             filtro_comp=args.competicion,
             filtro_cat=args.categoria,
-            headless=args.headless,
+            headless=not args.headed,
         ))
 
 
@@ -17,35 +17,107 @@ Estado de intentos guardado en intentos_resultados.json
 Uso:
   python scraper_resultados.py                # Una pasada (scraping)
   python scraper_resultados.py --check        # Solo mostrar pendientes (sin navegador)
-  python scraper_resultados.py --headless     # Intentar headless
+  python scraper_resultados.py --headed       # Navegador visible (depuración)
   python scraper_resultados.py --reset        # Limpiar estado de intentos
+  python scraper_resultados.py --watch        # Bucle continuo (navegador persistente)
 """
 
 import asyncio
 import json
+import mmap
+import os
 import re
 import sys
+import time
 import io
 import argparse
+import functools
+import pickle
 import random
 import logging
 import unicodedata
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from difflib import SequenceMatcher
 from pathlib import Path
 from typing import Optional
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el json de la stdlib
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:  # rapidfuzz es opcional: sin él se usa difflib
+    fuzz = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # selectolax es opcional: sin él se parsea vía navegador
+    HTMLParser = None
 
 # ─── Configuracion (desde team_config.json) ─────────────────────────────
 
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_FILE = SCRIPT_DIR / "team_config.json"
 
+
+# Por encima de este tamaño el fichero se mapea en vez de copiarse a bytes:
+# el pico de memoria del parseo deja de depender de la copia intermedia
+_UMBRAL_MMAP = 1_000_000
+
+
+def loads_json(path: Path):
+    """Parsea un fichero JSON directamente desde bytes. orjson (C) si está instalado."""
+    if orjson is not None:
+        if path.stat().st_size > _UMBRAL_MMAP:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                vista = memoryview(mm)
+                try:
+                    return orjson.loads(vista)
+                finally:
+                    vista.release()
+        return orjson.loads(path.read_bytes())
+    # json.loads acepta bytes UTF-8: se ahorra el read_text + decode aparte
+    return json.loads(path.read_bytes())
+
+
+def dumps_json(data) -> bytes:
+    """Serializa a bytes UTF-8 con indentación. orjson (C) si está instalado."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def escribir_json_atomico(path: Path, data) -> bool:
+    """Escribe el JSON con swap atómico, saltando escrituras idénticas.
+
+    Se escribe a un .tmp y se renombra con os.replace: un fallo a mitad de
+    escritura no puede dejar el fichero de temporada corrupto, y si el
+    contenido no cambió no se toca el disco. Devuelve True si se escribió.
+    """
+    payload = dumps_json(data)
+    try:
+        if path.read_bytes() == payload:
+            return False
+    except OSError:
+        pass
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+    return True
+
+
 def cargar_config() -> dict:
     if not CONFIG_FILE.exists():
         raise FileNotFoundError(
             f"No se encontró {CONFIG_FILE}. "
             "Copia team_config.example.json → team_config.json y ajústalo a tu equipo."
         )
-    return json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+    return loads_json(CONFIG_FILE)
 
 _CFG = cargar_config()
 TEAM_NAME = _CFG["team_name"]
@@ -53,6 +125,7 @@ TEAM_SLUG = _CFG["team_slug"]
 DURACION_PARTIDO_HORAS = _CFG.get("match_duration_hours", 1)
 MAX_INTENTOS = _CFG.get("max_retry_attempts", 5)
 RETRY_INTERVAL_MIN = _CFG.get("retry_interval_minutes", 10)
+MAX_PARALLEL_GRUPOS = _CFG.get("max_parallel_groups", 4)  # Páginas simultáneas por pasada
 
 DATA_BASE_DIR = SCRIPT_DIR / "src" / "data"
 LOG_DIR = SCRIPT_DIR / "logs"
@@ -68,7 +141,7 @@ def cargar_comp_url_map() -> dict:
     """Carga el mapa carpeta → URL generado por scraper_competicion.py"""
     if COMP_URL_MAP_FILE.exists():
         try:
-            return json.loads(COMP_URL_MAP_FILE.read_text(encoding="utf-8"))
+            return loads_json(COMP_URL_MAP_FILE)
         except Exception:
             pass
     logger.warning(f"No se encontró {COMP_URL_MAP_FILE}. Ejecuta primero scraper_competicion.py")
@@ -83,11 +156,18 @@ SEL_CAT = f"select[name='{DDL_CATEGORIAS}']"
 SEL_FASE = f"select[name='{DDL_FASES}']"
 SEL_GRUPO = f"select[name='{DDL_GRUPOS}']"
 
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:122.0) Gecko/20100101 Firefox/122.0",
-]
+# UA fijo: la clearance de Cloudflare queda ligada al user-agent, así que
+# rotarlo invalidaría la cookie persistida en cf_state.json entre ejecuciones
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36")
+
+# Client hints a juego con USER_AGENT: en headless Chromium anunciaría la
+# marca "HeadlessChrome" en sec-ch-ua y delataría el modo ante Cloudflare
+CLIENT_HINTS = {
+    "sec-ch-ua": '"Not A(Brand";v="99", "Google Chrome";v="121", "Chromium";v="121"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+}
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
@@ -108,25 +188,33 @@ logger = logging.getLogger(__name__)
 # ─── Estado de intentos ──────────────────────────────────────────────────────
 
 def cargar_intentos() -> dict:
-    """Carga el fichero de intentos. Formato: { "partido_id": { "intentos": N, "ultimo": "ISO" } }"""
+    """Carga el fichero de intentos. Formato: { "partido_id": { "intentos": N, "ultimo": epoch } }"""
     if INTENTOS_FILE.exists():
         try:
-            data = json.loads(INTENTOS_FILE.read_text(encoding="utf-8"))
-            # Limpiar entradas de mas de 48h (partidos viejos)
-            ahora = datetime.now()
-            cleaned = {}
+            data = loads_json(INTENTOS_FILE)
+            # Limpiar entradas de mas de 48h (partidos viejos) comparando
+            # epochs. Las entradas antiguas en ISO se migran parseando una
+            # sola vez; el siguiente guardado ya las persiste como número
+            corte = time.time() - 48 * 3600
+            limpio = {}
             for pid, info in data.items():
-                ultimo = datetime.fromisoformat(info.get("ultimo", "2000-01-01"))
-                if (ahora - ultimo).total_seconds() < 48 * 3600:
-                    cleaned[pid] = info
-            return cleaned
+                ultimo = info.get("ultimo", 0)
+                if isinstance(ultimo, str):
+                    try:
+                        ultimo = datetime.fromisoformat(ultimo).timestamp()
+                    except ValueError:
+                        continue
+                    info["ultimo"] = ultimo
+                if ultimo >= corte:
+                    limpio[pid] = info
+            return limpio
         except Exception:
             return {}
     return {}
 
 
 def guardar_intentos(intentos: dict):
-    INTENTOS_FILE.write_text(json.dumps(intentos, ensure_ascii=False, indent=2), encoding="utf-8")
+    escribir_json_atomico(INTENTOS_FILE, intentos)
 
 
 def resetear_intentos():
@@ -137,25 +225,59 @@ def resetear_intentos():
 
 # ─── Utilidades ──────────────────────────────────────────────────────────────
 
+# Compilados una vez: parse_fecha corre una vez por partido en cada re-parseo
+# de fichero y el split + ints sueltos + replace() eran su coste dominante.
+_RE_FECHA_DMA = re.compile(r"\s*(\d{1,2})/(\d{1,2})/(\d{4})\s*")
+_RE_HORA_HM = re.compile(r"\s*(\d{1,2}):(\d{1,2})\s*")
+
+_FECHA_INVALIDA = datetime(2000, 1, 1)
+
+
 def parse_fecha(fecha_str: str, hora_str: str) -> datetime:
+    m = _RE_FECHA_DMA.fullmatch(fecha_str or "")
+    if not m:
+        return _FECHA_INVALIDA
+    hora, minuto = 12, 0
+    if hora_str and ":" in hora_str:
+        mh = _RE_HORA_HM.fullmatch(hora_str)
+        if not mh:
+            return _FECHA_INVALIDA
+        hora, minuto = int(mh[1]), int(mh[2])
     try:
-        d, m, y = fecha_str.split("/")
-        dt = datetime(int(y), int(m), int(d))
-        if hora_str and ":" in hora_str:
-            h, mi = hora_str.split(":")
-            dt = dt.replace(hour=int(h), minute=int(mi))
-        else:
-            dt = dt.replace(hour=12, minute=0)
-        return dt
-    except Exception:
-        return datetime(2000, 1, 1)
+        # Un único constructor con todos los campos en vez de datetime+replace
+        return datetime(int(m[3]), int(m[2]), int(m[1]), hora, minuto)
+    except ValueError:
+        return _FECHA_INVALIDA
+
+
+# Patrones compilados una vez: estas normalizaciones corren miles de veces
+# dentro del bucle de matching de actualizar_json.
+_RE_NON_WORD = re.compile(r"[^\w\s-]")
+_RE_DASH_SPACE = re.compile(r"[-\s]+")
+_RE_WS = re.compile(r"\s+")
+
+# Transliteración directa de los acentos habituales: evita el round-trip
+# unicodedata.normalize + encode/decode en cada llamada.
+_ACCENT_TBL = str.maketrans(
+    "áéíóúàèìòùäëïöüâêîôûÁÉÍÓÚÀÈÌÒÙÄËÏÖÜÂÊÎÔÛñÑçÇ",
+    "aeiouaeiouaeiouaeiouAEIOUAEIOUAEIOUAEIOUnNcC",
+)
+
+
+def quitar_acentos(s: str) -> str:
+    """Quita acentos vía tabla de traducción; unicodedata solo como último recurso."""
+    s = s.translate(_ACCENT_TBL)
+    if s.isascii():
+        return s
+    s = unicodedata.normalize("NFD", s)
+    return s.encode("ascii", "ignore").decode("ascii")
 
 
+@functools.lru_cache(maxsize=4096)
 def slugify(text: str) -> str:
-    text = unicodedata.normalize("NFD", text)
-    text = text.encode("ascii", "ignore").decode("ascii")
-    text = re.sub(r"[^\w\s-]", "", text).strip().lower()
-    text = re.sub(r"[-\s]+", "-", text)
+    text = quitar_acentos(text)
+    text = _RE_NON_WORD.sub("", text).strip().lower()
+    text = _RE_DASH_SPACE.sub("-", text)
     return text
 
 
@@ -163,23 +285,50 @@ async def pausa(lo: float = 0.5, hi: float = 1.5):
     await asyncio.sleep(random.uniform(lo, hi))
 
 
+@functools.lru_cache(maxsize=4096)
 def normalizar_nombre(nombre: str) -> str:
     """Normaliza un nombre de equipo para comparación robusta.
-    Quita acentos, pasa a minúsculas, elimina espacios extra."""
-    s = unicodedata.normalize("NFD", nombre)
-    s = s.encode("ascii", "ignore").decode("ascii")
+    Quita acentos, pasa a minúsculas, elimina espacios extra.
+    Cacheado: los mismos nombres se normalizan miles de veces en el matching."""
+    s = quitar_acentos(nombre)
     s = s.lower().strip()
-    s = re.sub(r"\s+", " ", s)
+    s = _RE_WS.sub(" ", s)
     return s
 
 
+@functools.lru_cache(maxsize=4096)
+def _ascii_lower(s: str) -> str:
+    """quitar_acentos + lower + strip, cacheado (para comparar con carpetas)."""
+    return quitar_acentos(s).lower().strip()
+
+
+@functools.lru_cache(maxsize=8192)
+def _ratio_similitud(a: str, b: str) -> float:
+    # rapidfuzz calcula el mismo ratio en C, 10-100x más rápido que difflib
+    if fuzz is not None:
+        return fuzz.ratio(a, b) / 100.0
+    # Las cotas superiores quick_ratio descartan la mayoría de no-matches
+    # sin pagar el ratio() completo, que es O(N·M)
+    sm = SequenceMatcher(None, a, b)
+    if sm.real_quick_ratio() < 0.6 or sm.quick_ratio() < 0.6:
+        return 0.0
+    return sm.ratio()
+
+
 def nombres_coinciden(nombre_json: str, nombre_web: str) -> bool:
     """Compara nombres de equipos de forma flexible.
     Los patrocinadores rotan (ej: 'ISAVAL CBA' → 'NOATUM LOGISTIC CBA'),
     así que hacemos matching parcial inteligente."""
-    a = normalizar_nombre(nombre_json)
-    b = normalizar_nombre(nombre_web)
+    return _coinciden_normalizados(normalizar_nombre(nombre_json), normalizar_nombre(nombre_web))
+
 
+@functools.lru_cache(maxsize=8192)
+def _coinciden_normalizados(a: str, b: str) -> bool:
+    """Núcleo de nombres_coinciden sobre nombres ya normalizados.
+
+    Permite a los bucles calientes normalizar cada lista una sola vez
+    (SoA) en lugar de por comparación. Cacheado: los mismos pares se
+    re-evalúan en cada pasada del watcher y entre ficheros del mismo grupo."""
     # Exacto
     if a == b:
         return True
@@ -206,10 +355,12 @@ def nombres_coinciden(nombre_json: str, nombre_web: str) -> bool:
         if palabras_a[:2] == palabras_b[:2]:
             return True
 
-    # Ratio de similitud con SequenceMatcher
-    from difflib import SequenceMatcher
-    ratio = SequenceMatcher(None, a, b).ratio()
-    if ratio >= 0.6:
+    # Descarte barato por longitudes antes de tocar SequenceMatcher
+    if not a or not b or abs(len(a) - len(b)) / max(len(a), len(b)) > 0.6:
+        return False
+
+    # Ratio de similitud con SequenceMatcher (cacheado por par ordenado)
+    if _ratio_similitud(*sorted((a, b))) >= 0.6:
         return True
 
     return False
@@ -217,59 +368,164 @@ def nombres_coinciden(nombre_json: str, nombre_web: str) -> bool:
 
 # ─── Detectar partidos pendientes ────────────────────────────────────────────
 
-def buscar_partidos_pendientes() -> list[dict]:
+# Caché de JSON parseados con invalidación por mtime: el disparador ejecuta
+# este script cada ~10 min y la mayoría de ficheros no cambia entre pasadas,
+# así que en caliente el parseo cuesta prácticamente cero.
+JSON_CACHE_FILE = SCRIPT_DIR / ".json_cache.pkl"
+_JSON_CACHE_VER = 3  # Se incrementa al cambiar el formato de las entradas
+_JSON_CACHE: dict[str, tuple[int, Optional[list], Optional[list]]] = {}
+_JSON_CACHE_SUCIA = False  # Solo se re-escribe el pickle si hubo cambios
+
+
+def _cargar_json_cache() -> dict:
+    if JSON_CACHE_FILE.exists():
+        try:
+            with open(JSON_CACHE_FILE, "rb") as f:
+                cargado = pickle.load(f)
+            if cargado.get("version") == _JSON_CACHE_VER:
+                return cargado["entradas"]
+        except Exception:
+            pass
+    return {}
+
+
+def _guardar_json_cache():
+    global _JSON_CACHE_SUCIA
+    if not _JSON_CACHE_SUCIA:
+        return
+    try:
+        with open(JSON_CACHE_FILE, "wb") as f:
+            pickle.dump({"version": _JSON_CACHE_VER, "entradas": _JSON_CACHE},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        _JSON_CACHE_SUCIA = False
+    except Exception:
+        pass
+
+
+def _cachear(clave: str, entrada: tuple):
+    global _JSON_CACHE_SUCIA
+    _JSON_CACHE[clave] = entrada
+    _JSON_CACHE_SUCIA = True
+
+
+def _candidatos_pendientes(data: list) -> list[tuple]:
+    """Partidos sin resultado con inicio y fin estimado ya parseados.
+
+    Se precalcula al cachear: así las pasadas calientes solo iteran los
+    pocos candidatos de cada fichero y comparan datetimes ya construidos,
+    sin re-filtrar ni re-parsear las fechas de toda la temporada."""
+    duracion = timedelta(hours=DURACION_PARTIDO_HORAS)
+    candidatos = []
+    for partido in data:
+        if partido.get("es_resultado"):
+            continue
+        fecha_str = partido.get("fecha", "")
+        if not fecha_str or not partido.get("id"):
+            continue
+        dt_inicio = parse_fecha(fecha_str, partido.get("hora", ""))
+        candidatos.append((partido, dt_inicio, dt_inicio + duracion))
+    return candidatos
+
+
+def _load_one(json_path: Path) -> tuple[Path, Optional[list], Optional[list], Optional[datetime]]:
+    """Lee y parsea un JSON de equipo (con caché por mtime).
+    Devuelve (path, data, candidatos, min_fin), con None en caso de error.
+    min_fin es el fin estimado más temprano entre los candidatos: permite
+    descartar el fichero entero si su primer pendiente aún no ha terminado."""
+    clave = str(json_path)
+    try:
+        mtime = json_path.stat().st_mtime_ns
+    except OSError:
+        return json_path, None, None, None
+
+    cached = _JSON_CACHE.get(clave)
+    if cached is not None and len(cached) == 4 and cached[0] == mtime:
+        return json_path, cached[1], cached[2], cached[3]
+
+    try:
+        data = loads_json(json_path)
+    except Exception:
+        return json_path, None, None, None
+    if not isinstance(data, list):
+        _cachear(clave, (mtime, None, None, None))
+        return json_path, None, None, None
+    candidatos = _candidatos_pendientes(data)
+    min_fin = min((fin for _, _, fin in candidatos), default=None)
+    _cachear(clave, (mtime, data, candidatos, min_fin))
+    return json_path, data, candidatos, min_fin
+
+
+def buscar_partidos_pendientes(solo_existencia: bool = False) -> list[dict]:
     """
     Escanea JSON del equipo (TEAM_SLUG). Devuelve partidos:
     - Sin resultado + hora+duración < ahora + intentos < MAX_INTENTOS
+
+    Con solo_existencia devuelve en cuanto encuentra el primero: sonda
+    barata para saber si hay algo que hacer sin construir la lista entera.
     """
     ahora = datetime.now()
     intentos = cargar_intentos()
     pendientes = []
-    archivos_revisados = 0
+    pids_vistos = set()
     descartados = 0
     glob_pattern = f"{TEAM_SLUG}*.json"
 
-    for json_path in DATA_BASE_DIR.rglob(glob_pattern):
-        archivos_revisados += 1
-        try:
-            data = json.loads(json_path.read_text(encoding="utf-8"))
-            if not isinstance(data, list):
-                continue
-        except Exception:
+    if not _JSON_CACHE:
+        _JSON_CACHE.update(_cargar_json_cache())
+
+    # Lectura+parseo en un pool de hilos: es I/O de disco puro y escala casi
+    # lineal con los workers en frío; el filtrado por partido sigue en serie.
+    archivos = list(DATA_BASE_DIR.rglob(glob_pattern))
+    with ThreadPoolExecutor(max_workers=min(32, max(len(archivos), 1))) as ex:
+        cargados = list(ex.map(_load_one, archivos))
+    archivos_revisados = len(archivos)
+
+    # Expulsar entradas de ficheros que ya no existen (temporadas borradas o
+    # renombradas): la caché no debe crecer sin límite entre pasadas
+    vivos = {str(p) for p in archivos}
+    muertos = [clave for clave in _JSON_CACHE if clave not in vivos]
+    if muertos:
+        global _JSON_CACHE_SUCIA
+        for clave in muertos:
+            del _JSON_CACHE[clave]
+        _JSON_CACHE_SUCIA = True
+
+    _guardar_json_cache()
+
+    for json_path, data, candidatos, min_fin in cargados:
+        # Si ni el pendiente más temprano del fichero ha terminado aún,
+        # no hay nada accionable dentro: fuera sin iterar candidatos
+        if not candidatos or min_fin >= ahora:
             continue
 
-        for partido in data:
-            if partido.get("es_resultado"):
-                continue
-
-            fecha_str = partido.get("fecha", "")
-            hora_str = partido.get("hora", "")
-            if not fecha_str:
-                continue
-
-            dt_inicio = parse_fecha(fecha_str, hora_str)
-            dt_fin_estimado = dt_inicio + timedelta(hours=DURACION_PARTIDO_HORAS)
+        # Las carpetas del path son las mismas para todo el fichero:
+        # calcularlas una vez fuera del bucle por partido
+        parts = json_path.relative_to(DATA_BASE_DIR).parts
+        if len(parts) < 5:
+            continue
 
+        for partido, dt_inicio, dt_fin_estimado in candidatos:
             if dt_fin_estimado >= ahora:
                 continue
 
-            pid = partido.get("id", "")
-            if not pid:
+            pid = partido["id"]
+            # Un mismo id puede aparecer duplicado (entrada repetida en un
+            # fichero o el mismo partido en dos calendarios): con programarlo
+            # una vez basta, actualizar_json procesa el fichero entero
+            if pid in pids_vistos:
                 continue
-
+            pids_vistos.add(pid)
             info = intentos.get(pid, {})
             n_intentos = info.get("intentos", 0)
             if n_intentos >= MAX_INTENTOS:
                 descartados += 1
                 continue
 
-            rel = json_path.relative_to(DATA_BASE_DIR)
-            parts = rel.parts
-            if len(parts) < 5:
-                continue
-
             pendientes.append({
                 "partido": partido,
+                # Referencia compartida por todos los partidos del fichero:
+                # evita que actualizar_json vuelva a parsearlo
+                "data": data,
                 "json_path": str(json_path),
                 "comp_carpeta": parts[0],
                 "cat_carpeta": parts[1],
@@ -279,6 +535,8 @@ def buscar_partidos_pendientes() -> list[dict]:
                 "pid": pid,
                 "intento": n_intentos + 1,
             })
+            if solo_existencia:
+                return pendientes
 
     logger.info(f"Revisados {archivos_revisados} archivos de {TEAM_NAME}")
     if descartados:
@@ -286,44 +544,106 @@ def buscar_partidos_pendientes() -> list[dict]:
     return pendientes
 
 
-def agrupar_por_grupo(pendientes: list[dict]) -> dict[str, list[dict]]:
+def agrupar_por_grupo(pendientes: list[dict]) -> dict[tuple, list[dict]]:
+    # Clave tupla: hashable, se desempaqueta directo y no hay que re-partir
+    # cadenas (ni ambigüedad si una carpeta llevara el separador)
     grupos = {}
     for p in pendientes:
-        key = f"{p['comp_carpeta']}|{p['cat_carpeta']}|{p['grupo_carpeta']}|{p['fase_carpeta']}"
+        key = (p["comp_carpeta"], p["cat_carpeta"], p["grupo_carpeta"], p["fase_carpeta"])
         grupos.setdefault(key, []).append(p)
     return grupos
 
 
 # ─── Browser helpers ─────────────────────────────────────────────────────────
 
-async def crear_browser(headless: bool = False):
+# El scraper solo consulta la tabla #calendario: imágenes (escudos), fuentes,
+# media y CSS son peso muerto en cada carga y se abortan en la capa de routing.
+_TIPOS_BLOQUEADOS = {"image", "font", "media", "stylesheet"}
+
+# Terceros de analítica/publicidad que la página arrastra y que aquí solo
+# cuestan bytes y handshakes
+_HOSTS_BLOQUEADOS = ("google-analytics.com", "googletagmanager.com",
+                     "doubleclick.net", "facebook.net")
+
+
+async def _bloquear_recursos(route):
+    req = route.request
+    # Los assets del challenge de Cloudflare (/cdn-cgi/) se dejan pasar
+    if req.resource_type in _TIPOS_BLOQUEADOS and "/cdn-cgi/" not in req.url:
+        await route.abort()
+        return
+    # Comparar contra el host real de la URL, no contra la URL completa:
+    # evita falsos positivos con dominios que aparezcan en la query string
+    host = urlsplit(req.url).hostname or ""
+    if host.endswith(_HOSTS_BLOQUEADOS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Estado de sesión (cookies cf_clearance) compartido con scraper_competicion:
+# con la cookie válida CF acepta la sesión sin volver a lanzar el challenge.
+CF_STATE_FILE = SCRIPT_DIR / "cf_state.json"
+_CF_RESUELTO = False
+
+
+async def _guardar_estado_cf(page):
+    global _CF_RESUELTO
+    if not _CF_RESUELTO:
+        try:
+            await page.context.storage_state(path=str(CF_STATE_FILE))
+        except Exception:
+            pass
+    _CF_RESUELTO = True
+
+
+async def crear_browser(headless: bool = True):
     from playwright.async_api import async_playwright
-    from playwright_stealth import Stealth
 
     pw = await async_playwright().start()
     browser = await pw.chromium.launch(
         headless=headless,
         args=["--no-sandbox", "--disable-setuid-sandbox",
               "--disable-blink-features=AutomationControlled",
-              "--disable-dev-shm-usage"],
+              "--disable-dev-shm-usage",
+              # Recortes de servicios que el scraper no usa: arranque más
+              # rápido y menos RSS residente en el modo --watch
+              "--disable-extensions",
+              "--disable-background-networking",
+              "--disable-sync",
+              "--disable-default-apps",
+              "--no-first-run",
+              "--mute-audio",
+              "--disable-features=TranslateUI,MediaRouter"],
     )
+    return pw, browser
+
+
+async def crear_context(browser):
+    from playwright_stealth import Stealth
+
     stealth = Stealth()
     context = await browser.new_context(
-        user_agent=random.choice(USER_AGENTS),
+        user_agent=USER_AGENT,
         viewport={"width": 1366, "height": 768},
         locale="es-ES",
         timezone_id="Europe/Madrid",
-        extra_http_headers={"Accept-Language": "es-ES,es;q=0.9"},
+        extra_http_headers={"Accept-Language": "es-ES,es;q=0.9", **CLIENT_HINTS},
+        # Reutilizar la clearance de CF de una ejecución anterior si existe
+        storage_state=str(CF_STATE_FILE) if CF_STATE_FILE.exists() else None,
     )
     await stealth.apply_stealth_async(context)
+    await context.route("**/*", _bloquear_recursos)
     page = await context.new_page()
-    return pw, browser, context, page
+    return context, page
 
 
 async def esperar_pagina(page, timeout: int = 60000) -> bool:
     try:
         await page.wait_for_selector(SEL_CAT, timeout=timeout, state="visible")
-        await asyncio.sleep(0.5)  # Pequeña pausa adicional para asegurar estabilidad
+        if not _CF_RESUELTO:
+            await asyncio.sleep(0.5)  # Pequeña pausa adicional para asegurar estabilidad
+        await _guardar_estado_cf(page)
         return True
     except Exception:
         try:
@@ -333,18 +653,44 @@ async def esperar_pagina(page, timeout: int = 60000) -> bool:
                 try:
                     await page.wait_for_selector(SEL_CAT, timeout=120000, state="visible")
                     await asyncio.sleep(1.0)  # Pausa adicional tras resolver CF
+                    await _guardar_estado_cf(page)
                     return True
                 except Exception:
+                    # La clearance persistida ya no vale: invalidarla para
+                    # que la próxima ejecución arranque con sesión limpia
+                    CF_STATE_FILE.unlink(missing_ok=True)
                     return False
         except Exception:
             pass
         return False
 
 
-async def obtener_opciones(page, selector: str) -> list[dict]:
-    return await page.eval_on_selector_all(
-        selector + " option",
-        "opts => opts.map(o => ({value: o.value, text: o.textContent.trim().replace(/\\s+/g, ' ')}))",
+# Un único page.evaluate lee los tres <select> (opciones y valor actual) de
+# golpe: cada llamada Playwright es un viaje por el websocket y los tres
+# round-trips sueltos pesaban más que el propio trabajo DOM.
+JS_SNAPSHOT_DROPDOWNS = """
+(sels) => {
+    const leer = (sel) => Array.from(document.querySelectorAll(sel + ' option'))
+        .map(o => ({value: o.value, text: o.textContent.trim().replace(/\\s+/g, ' ')}));
+    const val = (sel) => {
+        const el = document.querySelector(sel);
+        return el ? el.value : '';
+    };
+    return {
+        categorias: leer(sels.cat),
+        fases: leer(sels.fase),
+        grupos: leer(sels.grupo),
+        seleccion: {categoria: val(sels.cat), fase: val(sels.fase), grupo: val(sels.grupo)},
+    };
+}
+"""
+
+
+async def snapshot_dropdowns(page) -> dict:
+    """Lee las opciones de los tres dropdowns en un único viaje al navegador."""
+    return await page.evaluate(
+        JS_SNAPSHOT_DROPDOWNS,
+        {"cat": SEL_CAT, "fase": SEL_FASE, "grupo": SEL_GRUPO},
     )
 
 
@@ -360,16 +706,22 @@ async def seleccionar_dropdown(page, selector: str, ddl_name: str, value: str, m
             try:
                 async with page.expect_navigation(wait_until="load", timeout=90000):
                     await page.select_option(selector, value)
-                await asyncio.sleep(1.0)
             except Exception as nav_error:
                 # La navegación puede fallar si es muy rápida o no hay cambio real
                 logger.debug(f"  Navigation event timeout (puede ser normal): {nav_error}")
-                await asyncio.sleep(2.0)
-            
+
+            # Espera dirigida en vez de sleeps fijos: el postback ha terminado
+            # cuando el documento vuelve a estar completo
+            try:
+                await page.wait_for_function(
+                    "() => document.readyState === 'complete'", timeout=10000
+                )
+            except Exception:
+                pass
+
             # Verificar que la página esté lista
             ok = await esperar_pagina(page, timeout=90000)
             if ok:
-                await pausa(1.0, 2.0)
                 return True
             
             if intento < max_retries - 1:
@@ -386,45 +738,192 @@ async def seleccionar_dropdown(page, selector: str, ddl_name: str, value: str, m
     return False
 
 
+# ─── Postback directo por HTTP ───────────────────────────────────────────────
+
+# Serializa el formulario ASP.NET completo (VIEWSTATE, EVENTVALIDATION y el
+# valor actual de cada campo) para poder replicar un __doPostBack por HTTP.
+JS_FORM_STATE = """
+() => {
+    const form = document.forms[0];
+    if (!form) return {};
+    const campos = {};
+    new FormData(form).forEach((v, k) => { campos[k] = v; });
+    return campos;
+}
+"""
+
+
+async def postback_http(page, url: str, ddl_name: str, value: str,
+                        cargar_en_pagina: bool = True,
+                        campos: Optional[dict] = None) -> Optional[str]:
+    """Replica el postback de un dropdown con un POST directo al servidor.
+
+    Usa el APIRequestContext del contexto (comparte las cookies de CF ya
+    calentadas). Con cargar_en_pagina la respuesta se monta con set_content,
+    así la extracción JS existente sigue funcionando sobre el DOM; si no,
+    se devuelve el HTML crudo para parsearlo en Python. Si se pasan campos
+    (p. ej. parseados de la respuesta anterior con _campos_de_form_html) se
+    ahorra también el viaje al navegador para serializar el formulario.
+    Devuelve el HTML, o None si no sirvió.
+    """
+    if campos is None:
+        campos = await page.evaluate(JS_FORM_STATE)
+    else:
+        campos = dict(campos)
+    if "__VIEWSTATE" not in campos:
+        return None
+
+    campos["__EVENTTARGET"] = ddl_name
+    campos["__EVENTARGUMENT"] = ""
+    campos[ddl_name] = value
+
+    resp = await page.context.request.post(url, form=campos)
+    if not resp.ok:
+        logger.debug(f"  Postback HTTP {resp.status} para {ddl_name}")
+        return None
+
+    html = await resp.text()
+    # La respuesta debe traer los dropdowns; si no, era un challenge/error
+    if "DDLCategorias" not in html:
+        return None
+    if cargar_en_pagina:
+        await page.set_content(html, wait_until="domcontentloaded")
+    return html
+
+
+async def cambiar_dropdown(page, url: str, selector: str, ddl_name: str, value: str,
+                           max_retries: int = 2) -> bool:
+    """Cambia un dropdown: primero por POST directo, con la navegación
+    completa de seleccionar_dropdown como fallback."""
+    try:
+        if await postback_http(page, url, ddl_name, value):
+            return True
+    except Exception as e:
+        logger.debug(f"  Postback HTTP falló ({ddl_name}): {e}")
+    return await seleccionar_dropdown(page, selector, ddl_name, value, max_retries=max_retries)
+
+
+def _campos_de_form_html(html: str) -> Optional[dict]:
+    """Reconstruye los campos del formulario ASP.NET desde el HTML de una
+    respuesta de postback, como haría FormData sobre el DOM. Permite
+    encadenar postbacks por HTTP sin cargar cada respuesta en la página."""
+    form = HTMLParser(html).css_first("form")
+    if form is None:
+        return None
+    campos: dict = {}
+    for inp in form.css("input"):
+        nombre = inp.attributes.get("name")
+        if not nombre:
+            continue
+        tipo = (inp.attributes.get("type") or "text").lower()
+        if tipo in ("submit", "button", "image", "reset"):
+            continue
+        if tipo in ("checkbox", "radio") and "checked" not in inp.attributes:
+            continue
+        campos[nombre] = inp.attributes.get("value") or ""
+    for sel in form.css("select"):
+        nombre = sel.attributes.get("name")
+        if not nombre:
+            continue
+        opciones = sel.css("option")
+        elegida = next((o for o in opciones if "selected" in o.attributes),
+                       opciones[0] if opciones else None)
+        campos[nombre] = (elegida.attributes.get("value") or "") if elegida is not None else ""
+    for ta in form.css("textarea"):
+        nombre = ta.attributes.get("name")
+        if nombre:
+            campos[nombre] = ta.text()
+    return campos if "__VIEWSTATE" in campos else None
+
+
+def _snapshot_de_html(html: str) -> dict:
+    """Versión selectolax de snapshot_dropdowns sobre el HTML de un postback."""
+    tree = HTMLParser(html)
+
+    def leer(selector: str) -> tuple[list[dict], str]:
+        sel = tree.css_first(selector)
+        if sel is None:
+            return [], ""
+        opciones, actual = [], ""
+        for o in sel.css("option"):
+            valor = o.attributes.get("value") or ""
+            opciones.append({"value": valor, "text": o.text().strip()})
+            if "selected" in o.attributes:
+                actual = valor
+        # Sin atributo selected el navegador toma la primera opción
+        if not actual and opciones:
+            actual = opciones[0]["value"]
+        return opciones, actual
+
+    categorias, sel_cat = leer(SEL_CAT)
+    fases, sel_fase = leer(SEL_FASE)
+    grupos, sel_grupo = leer(SEL_GRUPO)
+    return {"categorias": categorias, "fases": fases, "grupos": grupos,
+            "seleccion": {"categoria": sel_cat, "fase": sel_fase, "grupo": sel_grupo}}
+
+
 async def extraer_partidos_pagina(page) -> list[dict]:
+    # La activación del tab calendario va dentro del mismo evaluate que la
+    # extracción: un único round-trip de websocket en vez de count +
+    # get_attribute + click por separado
     return await page.evaluate("""
-        () => {
+        async () => {
+            const WS = /\\s+/g;
+            const QT = /"/g;
             const resultados = [];
+            const tab = document.getElementById('calendario-tab');
+            if (tab && tab.getAttribute('aria-selected') !== 'true') {
+                tab.click();
+                await new Promise(r => setTimeout(r, 300));
+            }
             const cal = document.getElementById('calendario');
             if (!cal) return resultados;
 
-            cal.querySelectorAll('header.nombre_tabla').forEach(header => {
+            // for..of sobre HTMLCollections nativas (cells, tBodies) en vez
+            // de querySelectorAll + forEach: sin closures por fila ni coste
+            // de selector CSS
+            for (const header of cal.querySelectorAll('header.nombre_tabla')) {
                 const h5 = header.querySelector('h5');
-                const jornada = h5 ? h5.textContent.trim().replace(/\\s+/g, ' ') : '';
+                const jornada = h5 ? h5.textContent.trim().replace(WS, ' ') : '';
 
                 let tc = header.nextElementSibling;
                 while (tc && !tc.classList.contains('table-responsive')) tc = tc.nextElementSibling;
-                if (!tc) return;
+                if (!tc) continue;
 
                 const tabla = tc.querySelector('table');
-                if (!tabla) return;
+                if (!tabla || !tabla.tBodies.length) continue;
 
-                tabla.querySelectorAll('tbody tr').forEach(fila => {
-                    const c = fila.querySelectorAll('td');
-                    if (c.length < 6) return;
+                for (const fila of tabla.tBodies[0].rows) {
+                    const c = fila.cells;
+                    if (c.length < 6) continue;
 
                     const local = c[0].textContent.trim();
                     const ptL = c[1].textContent.trim();
                     const ptV = c[2].textContent.trim();
                     const visitante = c[3].textContent.trim();
-                    if (!local || !visitante) return;
+                    if (!local || !visitante) continue;
 
+                    // Leer los nodos de texto alrededor del <br> directamente:
+                    // innerHTML fuerza una serialización HTML por celda
                     const strong = c[4].querySelector('strong');
                     let fecha = '', hora = '';
                     if (strong) {
-                        const parts = strong.innerHTML.split(/<br\\s*\\/?>/);
-                        fecha = (parts[0] || '').replace(/"/g, '').trim();
-                        if (parts[1]) hora = parts[1].replace(/"/g, '').trim();
+                        const textos = [];
+                        for (const n of strong.childNodes) {
+                            if (n.nodeType === 3) {
+                                const t = n.textContent.replace(QT, '').trim();
+                                if (t) textos.push(t);
+                            }
+                        }
+                        fecha = textos[0] || '';
+                        hora = textos[1] || '';
                     }
 
                     const pabellon = c[5] ? c[5].textContent.trim() : '';
-                    const ml = ptL && !isNaN(parseInt(ptL)) ? parseInt(ptL) : null;
-                    const mv = ptV && !isNaN(parseInt(ptV)) ? parseInt(ptV) : null;
+                    const nl = parseInt(ptL, 10);
+                    const nv = parseInt(ptV, 10);
+                    const ml = Number.isNaN(nl) ? null : nl;
+                    const mv = Number.isNaN(nv) ? null : nv;
 
                     resultados.push({
                         local, visitante,
@@ -433,53 +932,134 @@ async def extraer_partidos_pagina(page) -> list[dict]:
                         es_resultado: ml !== null && mv !== null,
                         jornada,
                     });
-                });
-            });
+                }
+            }
             return resultados;
         }
     """)
 
 
+_RE_BR = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_RE_TAGS = re.compile(r"<[^>]+>")
+
+
+def extraer_partidos_html(html: str) -> list[dict]:
+    """Versión Python de extraer_partidos_pagina sobre el HTML de un postback.
+
+    Parsear con selectolax (MyHTML en C) la respuesta del POST directo evita
+    montarla en el navegador con set_content solo para volver a leerla por
+    JS. Mismos campos de salida que la extracción JS.
+    """
+    resultados: list[dict] = []
+    cal = HTMLParser(html).css_first("#calendario")
+    if cal is None:
+        return resultados
+
+    for header in cal.css("header.nombre_tabla"):
+        h5 = header.css_first("h5")
+        jornada = _RE_WS.sub(" ", h5.text().strip()) if h5 else ""
+
+        tc = header.next
+        while tc is not None:
+            clases = tc.attributes.get("class") if tc.attributes else None
+            if clases and "table-responsive" in clases:
+                break
+            tc = tc.next
+        if tc is None:
+            continue
+        tabla = tc.css_first("table")
+        if tabla is None:
+            continue
+
+        for fila in tabla.css("tbody tr"):
+            c = fila.css("td")
+            if len(c) < 6:
+                continue
+
+            local = c[0].text().strip()
+            pt_l = c[1].text().strip()
+            pt_v = c[2].text().strip()
+            visitante = c[3].text().strip()
+            if not local or not visitante:
+                continue
+
+            strong = c[4].css_first("strong")
+            fecha, hora = "", ""
+            if strong is not None:
+                partes = _RE_BR.split(strong.html or "")
+                fecha = _RE_TAGS.sub("", partes[0]).replace('"', "").strip()
+                if len(partes) > 1:
+                    hora = _RE_TAGS.sub("", partes[1]).replace('"', "").strip()
+
+            pabellon = c[5].text().strip()
+            ml = int(pt_l) if pt_l.lstrip("-").isdigit() else None
+            mv = int(pt_v) if pt_v.lstrip("-").isdigit() else None
+
+            resultados.append({
+                "local": local, "visitante": visitante,
+                "marcador_local": ml, "marcador_visitante": mv,
+                "fecha": fecha, "hora": hora, "pabellon": pabellon,
+                "es_resultado": ml is not None and mv is not None,
+                "jornada": jornada,
+            })
+
+    return _internar_partidos(resultados)
+
+
+def _internar_partidos(partidos: list[dict]) -> list[dict]:
+    """Interna las columnas que se repiten entre filas (fecha, hora, pabellón,
+    jornada): las copias comparten objeto —y hash cacheado— en vez de llegar
+    como strings frescos de cada parseo, lo que abarata los índices por fecha
+    y la memoria retenida en modo --watch."""
+    for p in partidos:
+        p["fecha"] = sys.intern(p["fecha"])
+        p["hora"] = sys.intern(p["hora"])
+        p["pabellon"] = sys.intern(p["pabellon"])
+        p["jornada"] = sys.intern(p["jornada"])
+    return partidos
+
+
 # ─── Match dropdown to folder ───────────────────────────────────────────────
 
 def match_opcion_a_carpeta(opciones: list[dict], carpeta: str) -> Optional[str]:
     """Busca la opción del dropdown que mejor coincide con el nombre de carpeta.
     Prioriza exacto > exacto sin acentos > mejor substring."""
-    def strip_accents(s):
-        return unicodedata.normalize("NFD", s).encode("ascii", "ignore").decode("ascii").lower().strip()
+    # Las mismas opciones y carpetas se repiten entre grupos y entre pasadas
+    # del watcher: memoizar sobre una clave hashable evita repetir la pasada
+    return _match_opcion_cacheada(
+        tuple((opt["value"], opt["text"]) for opt in opciones), carpeta
+    )
 
-    carpeta_norm = carpeta.replace("-", " ").lower().strip()
-    carpeta_ascii = strip_accents(carpeta.replace("-", " "))
 
-    # Paso 1: Match exacto (con y sin acentos)
-    for opt in opciones:
-        opt_norm = opt["text"].lower().strip()
-        if opt_norm == carpeta_norm:
-            return opt["value"]
-    for opt in opciones:
-        if strip_accents(opt["text"]) == carpeta_ascii:
-            return opt["value"]
+@functools.lru_cache(maxsize=256)
+def _match_opcion_cacheada(opciones: tuple, carpeta: str) -> Optional[str]:
+    carpeta_limpia = carpeta.replace("-", " ")
+    carpeta_norm = carpeta_limpia.lower().strip()
+    carpeta_ascii = _ascii_lower(carpeta_limpia)
 
-    # Paso 2: Substring match - buscar el MEJOR match (más largo overlap)
+    # Una sola pasada con puntuación escalonada: exacto (3) > exacto sin
+    # acentos (2) > mejor overlap de substring (fracción en (0, 1]). Cada
+    # opción se normaliza una única vez y se queda el argmax
     best_match = None
-    best_score = 0
-    for opt in opciones:
-        opt_ascii = strip_accents(opt["text"])
-        # Solo match si la carpeta está contenida en la opción
-        # (no al revés, para evitar 'grupo a' matcheando 'grupo ascenso')
-        if carpeta_ascii == opt_ascii:
-            return opt["value"]
-        # Substring: carpeta contenida en opción, y la longitud es similar
-        if carpeta_ascii in opt_ascii:
+    best_score = 0.0
+    for value, text in opciones:
+        opt_norm = text.lower().strip()
+        opt_ascii = _ascii_lower(text)
+        if opt_norm == carpeta_norm:
+            return value
+        if opt_ascii == carpeta_ascii:
+            score = 2.0
+        elif carpeta_ascii in opt_ascii:
+            # Carpeta contenida en opción con longitud similar (no al revés
+            # prioritariamente, para evitar 'grupo a' vs 'grupo ascenso')
             score = len(carpeta_ascii) / max(len(opt_ascii), 1)
-            if score > best_score:
-                best_score = score
-                best_match = opt["value"]
         elif opt_ascii in carpeta_ascii:
             score = len(opt_ascii) / max(len(carpeta_ascii), 1)
-            if score > best_score:
-                best_score = score
-                best_match = opt["value"]
+        else:
+            continue
+        if score > best_score:
+            best_score = score
+            best_match = value
 
     if best_match and best_score >= 0.5:
         return best_match
@@ -489,34 +1069,90 @@ def match_opcion_a_carpeta(opciones: list[dict], carpeta: str) -> Optional[str]:
 
 # ─── Scraping dirigido de un grupo ──────────────────────────────────────────
 
+# HTML inicial de cada competición, cacheado por pasada: varios grupos de la
+# misma comp_url (categorías/fases distintas) comparten el GET inicial y su
+# exposición al challenge de CF. El DOM montado con set_content conserva el
+# VIEWSTATE, que es lo único que necesitan los postbacks por HTTP.
+_HTML_INICIAL: dict[str, str] = {}
+
+
 async def scrape_grupo(page, comp_url, cat_carpeta, fase_carpeta, grupo_carpeta) -> list[dict]:
     page_url = page.url or ""
     comp_base = comp_url.split("/delegacion-competicion")[0] if "/delegacion-competicion" in comp_url else ""
 
     if comp_base not in page_url:
-        logger.info(f"  Navegando a: {comp_url}")
-        await page.goto(comp_url, wait_until="domcontentloaded", timeout=60000)
-        if not await esperar_pagina(page, timeout=60000):
-            logger.error("  No se pudo cargar la pagina")
-            return []
-        await pausa(1.5, 3.0)
+        html_inicial = _HTML_INICIAL.get(comp_url)
+        if html_inicial is not None:
+            logger.info(f"  Reutilizando HTML inicial de: {comp_url}")
+            await page.set_content(html_inicial, wait_until="domcontentloaded")
+        else:
+            logger.info(f"  Navegando a: {comp_url}")
+            await page.goto(comp_url, wait_until="domcontentloaded", timeout=60000)
+            if not await esperar_pagina(page, timeout=60000):
+                logger.error("  No se pudo cargar la pagina")
+                return []
+            # Espera dirigida al reposo de red en vez de una pausa aleatoria
+            # larga; se conserva una pausa corta como ruido de comportamiento
+            try:
+                await page.wait_for_load_state("networkidle", timeout=5000)
+            except Exception:
+                pass
+            await pausa(0.5, 1.0)
+            _HTML_INICIAL[comp_url] = await page.content()
+
+    # Un snapshot por estado de página: cada postback solo obliga a releer
+    # una vez, y si el valor objetivo ya está seleccionado se ahorra entero
+    # (habitual en categorías con una sola fase o un solo grupo).
+    snap = await snapshot_dropdowns(page)
+
+    # Estado del encadenado de postbacks por HTTP: con selectolax, cada
+    # respuesta aporta los campos del formulario para el POST siguiente, así
+    # la cascada cat→fase→grupo son POSTs puros sin pasar por el renderer.
+    # Mientras hay encadenado la página queda desfasada a propósito.
+    html_actual: Optional[str] = None
+    campos_actuales: Optional[dict] = None
+
+    async def _cambiar(ddl_name: str, selector: str, value: str, max_retries: int) -> bool:
+        nonlocal html_actual, campos_actuales, snap
+        if HTMLParser is not None:
+            try:
+                html = await postback_http(page, comp_url, ddl_name, value,
+                                           cargar_en_pagina=False, campos=campos_actuales)
+            except Exception as e:
+                logger.debug(f"  Postback HTTP falló ({ddl_name}): {e}")
+                html = None
+            if html is not None:
+                html_actual = html
+                campos_actuales = _campos_de_form_html(html)
+                snap = _snapshot_de_html(html)
+                return True
+        if html_actual is not None:
+            # La página quedó atrás respecto al encadenado: sincronizarla
+            # antes de caer a la ruta con navegador
+            await page.set_content(html_actual, wait_until="domcontentloaded")
+            html_actual = None
+            campos_actuales = None
+        if not await cambiar_dropdown(page, comp_url, selector, ddl_name, value,
+                                      max_retries=max_retries):
+            return False
+        snap = await snapshot_dropdowns(page)
+        return True
 
     # Categoria
-    cats = await obtener_opciones(page, SEL_CAT)
-    cats = [c for c in cats if c["value"]]
+    cats = [c for c in snap["categorias"] if c["value"]]
     cat_value = match_opcion_a_carpeta(cats, cat_carpeta)
     if not cat_value:
         logger.error(f"  Categoria '{cat_carpeta}' no encontrada")
         return []
 
     logger.info(f"  Categoria: {cat_carpeta}")
-    if not await seleccionar_dropdown(page, SEL_CAT, DDL_CATEGORIAS, cat_value, max_retries=3):
-        logger.error(f"  No se pudo cambiar a categoría {cat_carpeta} tras múltiples intentos")
-        return []
+    if snap["seleccion"]["categoria"] != cat_value:
+        if not await _cambiar(DDL_CATEGORIAS, SEL_CAT, cat_value, 3):
+            logger.error(f"  No se pudo cambiar a categoría {cat_carpeta} tras múltiples intentos")
+            return []
 
     # Fase
-    fases = await obtener_opciones(page, SEL_FASE)
-    fases = [f for f in fases if f["value"]]
+    fases = [f for f in snap["fases"] if f["value"]]
     fase_value = match_opcion_a_carpeta(fases, fase_carpeta)
     if not fase_value:
         fase_value = fases[0]["value"] if len(fases) == 1 else None
@@ -525,13 +1161,13 @@ async def scrape_grupo(page, comp_url, cat_carpeta, fase_carpeta, grupo_carpeta)
         return []
 
     logger.info(f"  Fase: {fase_carpeta}")
-    if not await seleccionar_dropdown(page, SEL_FASE, DDL_FASES, fase_value, max_retries=2):
-        logger.warning(f"  No se pudo cambiar a fase {fase_carpeta}")
-        return []
+    if snap["seleccion"]["fase"] != fase_value:
+        if not await _cambiar(DDL_FASES, SEL_FASE, fase_value, 2):
+            logger.warning(f"  No se pudo cambiar a fase {fase_carpeta}")
+            return []
 
     # Grupo
-    grupos = await obtener_opciones(page, SEL_GRUPO)
-    grupos = [g for g in grupos if g["value"]]
+    grupos = [g for g in snap["grupos"] if g["value"]]
     grupo_value = match_opcion_a_carpeta(grupos, grupo_carpeta)
     if not grupo_value:
         grupo_value = grupos[0]["value"] if len(grupos) == 1 else None
@@ -540,71 +1176,110 @@ async def scrape_grupo(page, comp_url, cat_carpeta, fase_carpeta, grupo_carpeta)
         return []
 
     logger.info(f"  Grupo: {grupo_carpeta}")
-    if not await seleccionar_dropdown(page, SEL_GRUPO, DDL_GRUPOS, grupo_value, max_retries=2):
-        logger.warning(f"  No se pudo cambiar a grupo {grupo_carpeta}")
-        return []
-
-    # Tab calendario
-    try:
-        cal_tab = page.locator("#calendario-tab")
-        if await cal_tab.count() > 0:
-            aria = await cal_tab.get_attribute("aria-selected")
-            if aria != "true":
-                await cal_tab.click()
-                await pausa(0.5, 1.0)
-    except Exception:
-        pass
+    if snap["seleccion"]["grupo"] != grupo_value:
+        if not await _cambiar(DDL_GRUPOS, SEL_GRUPO, grupo_value, 2):
+            logger.warning(f"  No se pudo cambiar a grupo {grupo_carpeta}")
+            return []
 
-    partidos = await extraer_partidos_pagina(page)
+    # Con selectolax disponible no hace falta activar el tab calendario ni
+    # recorrer el DOM en el renderer: el HTML ya contiene las tablas (el tab
+    # solo cambia visibilidad) y se parsea en un hilo fuera del event loop
+    if html_actual is not None:
+        partidos = await asyncio.to_thread(extraer_partidos_html, html_actual)
+    elif HTMLParser is not None:
+        html = await page.content()
+        partidos = await asyncio.to_thread(extraer_partidos_html, html)
+    else:
+        partidos = _internar_partidos(await extraer_partidos_pagina(page))
     logger.info(f"  Extraidos {len(partidos)} partidos del grupo")
     return partidos
 
 
 # ─── Actualizar JSON ─────────────────────────────────────────────────────────
 
-def actualizar_json(json_path: str, partidos_web: list[dict]) -> list[str]:
-    """Devuelve lista de IDs actualizados."""
+def actualizar_json(json_path: str, data: Optional[list], partidos_web: list[dict],
+                    jornadas_esperadas: Optional[set] = None) -> list[str]:
+    """Escribe los resultados encontrados en el JSON del fichero.
+
+    data es la lista ya parseada por buscar_partidos_pendientes (referencia
+    compartida); solo se relee del disco si no viene. jornadas_esperadas
+    acota los partidos web a las jornadas de los pendientes del grupo.
+    Devuelve los IDs actualizados."""
     path = Path(json_path)
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except Exception as e:
-        logger.error(f"  Error leyendo {path}: {e}")
-        return []
+    if data is None:
+        try:
+            data = loads_json(path)
+        except Exception as e:
+            logger.error(f"  Error leyendo {path}: {e}")
+            return []
 
     if not isinstance(data, list):
         return []
 
+    # Acotar a las jornadas esperadas: menos comparaciones y menos falsos
+    # positivos cuando dos equipos se cruzan dos veces en la temporada. Si
+    # las etiquetas no casan (formato distinto en la web), mejor no filtrar
+    if jornadas_esperadas:
+        filtrados = [pw for pw in partidos_web
+                     if not pw.get("jornada") or pw["jornada"] in jornadas_esperadas]
+        if filtrados:
+            partidos_web = filtrados
+        else:
+            logger.debug("  Ninguna jornada web coincide con las esperadas; sin filtrar")
+
     ids_actualizados = []
 
+    # Normalizar los nombres de cada lista una sola vez (SoA) e indexar por
+    # fecha: el bucle interno solo recorre los partidos web de la misma fecha.
+    # web_exacto añade un atajo O(1) para el caso común de nombres idénticos
+    # tras normalizar (los JSON salieron del mismo scraper que la web)
+    web_por_fecha: dict[str, list[tuple]] = defaultdict(list)
+    web_exacto: dict[tuple, tuple] = {}
+    for pw in partidos_web:
+        if pw["es_resultado"]:
+            local_n = normalizar_nombre(pw["local"])
+            visitante_n = normalizar_nombre(pw["visitante"])
+            fecha = pw.get("fecha", "")
+            entrada = (pw, local_n, visitante_n)
+            web_por_fecha[fecha].append(entrada)
+            web_exacto[(fecha, local_n, visitante_n)] = entrada
+
     for partido in data:
         if partido.get("es_resultado"):
             continue
 
-        for pw in partidos_web:
-            if not pw["es_resultado"]:
-                continue
-            if pw["fecha"] != partido.get("fecha"):
-                continue
-
-            p_equipo = partido.get("equipo", "")
-            p_rival = partido.get("rival", "")
-            p_ubi = partido.get("ubicacion", "")
+        p_equipo = partido.get("equipo", "")
+        p_rival = partido.get("rival", "")
+        p_ubi = partido.get("ubicacion", "")
+        p_fecha = partido.get("fecha", "")
+        equipo_n = normalizar_nombre(p_equipo)
+        rival_n = normalizar_nombre(p_rival)
+
+        # Atajo exacto antes del matching laxo por fecha
+        if p_ubi == "Local":
+            hit = web_exacto.get((p_fecha, equipo_n, rival_n))
+        elif p_ubi == "Visitante":
+            hit = web_exacto.get((p_fecha, rival_n, equipo_n))
+        else:
+            hit = None
+        candidatos_web = (hit,) if hit else web_por_fecha.get(p_fecha, ())
 
+        for pw, local_n, visitante_n in candidatos_web:
             match = False
             if p_ubi == "Local":
                 # Nuestro equipo es local → comparar local(web) con equipo, visitante(web) con rival
-                if nombres_coinciden(p_equipo, pw["local"]) and nombres_coinciden(p_rival, pw["visitante"]):
+                if _coinciden_normalizados(equipo_n, local_n) and _coinciden_normalizados(rival_n, visitante_n):
                     match = True
-                elif nombres_coinciden(p_equipo, pw["local"]):
+                elif _coinciden_normalizados(equipo_n, local_n):
                     logger.debug(f"  Equipo OK pero rival NO: JSON='{p_rival}' WEB='{pw['visitante']}'")
             elif p_ubi == "Visitante":
                 # Nuestro equipo es visitante
-                if nombres_coinciden(p_equipo, pw["visitante"]) and nombres_coinciden(p_rival, pw["local"]):
+                if _coinciden_normalizados(equipo_n, visitante_n) and _coinciden_normalizados(rival_n, local_n):
                     match = True
-                elif nombres_coinciden(p_equipo, pw["visitante"]):
+                elif _coinciden_normalizados(equipo_n, visitante_n):
                     logger.debug(f"  Equipo OK pero rival NO: JSON='{p_rival}' WEB='{pw['local']}'")
 
-            if not match and nombres_coinciden(p_equipo, pw["local"] if p_ubi == "Local" else pw["visitante"]):
+            if not match and _coinciden_normalizados(equipo_n, local_n if p_ubi == "Local" else visitante_n):
                 # Fallback: si nuestro equipo coincide + misma fecha + misma jornada → match
                 pw_jornada = pw.get("jornada", "")
                 p_jornada = partido.get("jornada", "")
@@ -626,13 +1301,21 @@ def actualizar_json(json_path: str, partidos_web: list[dict]) -> list[str]:
                 break
 
     if ids_actualizados:
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        escribir_json_atomico(path, data)
+        # Refrescar la caché de parseo para no releer el fichero recién escrito
+        try:
+            candidatos = _candidatos_pendientes(data)
+            min_fin = min((fin for _, _, fin in candidatos), default=None)
+            _cachear(str(path), (path.stat().st_mtime_ns, data, candidatos, min_fin))
+        except OSError:
+            pass
         logger.info(f"  Guardado {path.name}: {len(ids_actualizados)} resultado(s)")
 
     return ids_actualizados
 
 
-def marcar_estado_sin_resultado(json_path: str, pid: str, partidos_web: list[dict]):
+def marcar_estado_sin_resultado(json_path: str, pid: str, partidos_web: list[dict],
+                                data: Optional[list] = None):
     """
     Marca un partido sin resultado tras agotar los {MAX_INTENTOS} intentos.
     
@@ -643,14 +1326,20 @@ def marcar_estado_sin_resultado(json_path: str, pid: str, partidos_web: list[dic
       → probablemente aún no lo han publicado → "Esperando resultado"
     """
     path = Path(json_path)
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return
+    if data is None:
+        try:
+            data = loads_json(path)
+        except Exception:
+            return
 
     if not isinstance(data, list):
         return
 
+    # Índice por fecha: evita filtrar toda la lista web por cada partido
+    web_por_fecha: dict[str, list[dict]] = defaultdict(list)
+    for p in partidos_web:
+        web_por_fecha[p.get("fecha", "")].append(p)
+
     modified = False
     for partido in data:
         if partido.get("id") != pid:
@@ -661,7 +1350,7 @@ def marcar_estado_sin_resultado(json_path: str, pid: str, partidos_web: list[dic
         fecha_partido = partido.get("fecha", "")
 
         # Buscar cuántos partidos de la misma fecha tienen resultado en la web
-        misma_fecha = [p for p in partidos_web if p.get("fecha") == fecha_partido]
+        misma_fecha = web_por_fecha.get(fecha_partido, [])
         con_resultado = [p for p in misma_fecha if p.get("es_resultado")]
 
         if len(misma_fecha) > 0 and len(con_resultado) >= len(misma_fecha) * 0.5:
@@ -678,18 +1367,24 @@ def marcar_estado_sin_resultado(json_path: str, pid: str, partidos_web: list[dic
         break
 
     if modified:
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        escribir_json_atomico(path, data)
 
 
 # ─── Pipeline principal ──────────────────────────────────────────────────────
 
-async def actualizar_resultados(headless: bool = False, check_only: bool = False) -> int:
+async def actualizar_resultados(headless: bool = True, check_only: bool = False,
+                                browser=None) -> int:
     logger.info("=" * 60)
     logger.info(f"SCRAPER RAPIDO DE RESULTADOS -- {TEAM_NAME}")
     logger.info(f"{datetime.now().strftime('%d/%m/%Y %H:%M')}")
     logger.info("=" * 60)
 
-    pendientes = buscar_partidos_pendientes()
+    # El HTML inicial cacheado caduca entre pasadas (VIEWSTATE viejo)
+    _HTML_INICIAL.clear()
+
+    # El escaneo es I/O de disco + parseo: fuera del hilo del event loop para
+    # no bloquear el tráfico websocket de Playwright en modo --watch
+    pendientes = await asyncio.to_thread(buscar_partidos_pendientes)
 
     if not pendientes:
         logger.info("No hay partidos pendientes de resultado.")
@@ -706,90 +1401,132 @@ async def actualizar_resultados(headless: bool = False, check_only: bool = False
         return len(pendientes)
 
     grupos = agrupar_por_grupo(pendientes)
-    logger.info(f"\n{len(grupos)} grupo(s) a scrapear")
-
-    pw_inst, browser, context, page = await crear_browser(headless=headless)
-    total_actualizados = 0
     intentos = cargar_intentos()
     comp_url_map = cargar_comp_url_map()
 
-    try:
-        for key, partidos_grupo in grupos.items():
-            comp_carpeta, cat_carpeta, grupo_carpeta, fase_carpeta = key.split("|")
+    def _sumar_intento(pid: str):
+        info = intentos.get(pid, {"intentos": 0})
+        info["intentos"] = info.get("intentos", 0) + 1
+        info["ultimo"] = time.time()
+        intentos[pid] = info
+        return info
+
+    # Descartar antes de lanzar Chromium los grupos sin URL de competición:
+    # si no queda nada scrapeable, el arranque del navegador (~2 s y una
+    # oportunidad más de challenge de CF) se ahorra entero
+    sin_url = {k: v for k, v in grupos.items() if not comp_url_map.get(k[0])}
+    for key, partidos_grupo in sin_url.items():
+        logger.warning(f"  Competicion '{key[0]}' sin URL. Saltando.")
+        for p in partidos_grupo:
+            _sumar_intento(p["pid"])
+    if sin_url:
+        grupos = {k: v for k, v in grupos.items() if k not in sin_url}
+
+    if not grupos:
+        logger.info("Ningun grupo con URL de competicion conocida; nada que scrapear.")
+        guardar_intentos(intentos)
+        return 0
 
-            comp_url = comp_url_map.get(comp_carpeta)
-            if not comp_url:
-                logger.warning(f"  Competicion '{comp_carpeta}' sin URL. Saltando.")
-                continue
+    # Los grupos más atrasados primero: cuando hay más grupos que páginas en
+    # el pool, el partido más "caliente" no espera al final de la cola
+    grupos = dict(sorted(grupos.items(),
+                         key=lambda kv: min(p["dt_inicio"] for p in kv[1])))
 
-            logger.info(f"\n{'─' * 50}")
-            logger.info(f"  {comp_carpeta} / {cat_carpeta} / {grupo_carpeta}")
+    logger.info(f"\n{len(grupos)} grupo(s) a scrapear")
 
-            try:
-                partidos_web = await scrape_grupo(
-                    page, comp_url, cat_carpeta, fase_carpeta, grupo_carpeta
-                )
-            except Exception as e:
-                logger.error(f"  Error scraping: {e}")
-                try:
-                    await page.goto("about:blank")
-                    await pausa(1.0, 2.0)
-                except Exception:
-                    pass
-                for p in partidos_grupo:
-                    info = intentos.get(p["pid"], {"intentos": 0})
-                    info["intentos"] = info.get("intentos", 0) + 1
-                    info["ultimo"] = datetime.now().isoformat()
-                    intentos[p["pid"]] = info
-                continue
+    # Si nos pasan un browser (modo --watch) lo reutilizamos y solo creamos
+    # un contexto fresco; si no, lanzamos y cerramos Chromium en esta pasada
+    browser_propio = browser is None
+    if browser_propio:
+        pw_inst, browser = await crear_browser(headless=headless)
+    context, _ = await crear_context(browser)
+    total_actualizados = 0
 
-            if not partidos_web:
-                for p in partidos_grupo:
-                    info = intentos.get(p["pid"], {"intentos": 0})
-                    info["intentos"] = info.get("intentos", 0) + 1
-                    info["ultimo"] = datetime.now().isoformat()
-                    intentos[p["pid"]] = info
-                continue
+    # Cada grupo es una navegación independiente: se scrapean en paralelo
+    # sobre un pool de páginas reutilizables del mismo contexto. La cola
+    # acota la concurrencia y, al conservarse page.url entre grupos, los de
+    # la misma competición se ahorran además el goto inicial
+    paginas: asyncio.Queue = asyncio.Queue()
+    for _ in range(min(MAX_PARALLEL_GRUPOS, len(grupos))):
+        paginas.put_nowait(await context.new_page())
 
-            con_resultado = [p for p in partidos_web if p["es_resultado"]]
-            logger.info(f"  Web: {len(partidos_web)} partidos ({len(con_resultado)} con resultado)")
+    async def procesar_un_grupo(key: str, partidos_grupo: list[dict]) -> int:
+        comp_carpeta, cat_carpeta, grupo_carpeta, fase_carpeta = key
+        comp_url = comp_url_map[comp_carpeta]
 
-            json_paths_vistos = set()
-            ids_encontrados = set()
-            for p in partidos_grupo:
-                jp = p["json_path"]
-                if jp not in json_paths_vistos:
-                    json_paths_vistos.add(jp)
-                    ids = actualizar_json(jp, partidos_web)
-                    ids_encontrados.update(ids)
-                    total_actualizados += len(ids)
+        logger.info(f"\n{'─' * 50}")
+        logger.info(f"  {comp_carpeta} / {cat_carpeta} / {grupo_carpeta}")
 
+        page = await paginas.get()
+        try:
+            partidos_web = await scrape_grupo(
+                page, comp_url, cat_carpeta, fase_carpeta, grupo_carpeta
+            )
+        except Exception as e:
+            logger.error(f"  Error scraping: {e}")
+            partidos_web = []
+        finally:
+            paginas.put_nowait(page)
+
+        if not partidos_web:
             for p in partidos_grupo:
-                pid = p["pid"]
-                if pid in ids_encontrados:
-                    intentos.pop(pid, None)
+                _sumar_intento(p["pid"])
+            return 0
+
+        con_resultado = [p for p in partidos_web if p["es_resultado"]]
+        logger.info(f"  Web: {len(partidos_web)} partidos ({len(con_resultado)} con resultado)")
+
+        actualizados = 0
+        json_paths_vistos = set()
+        ids_encontrados = set()
+        jornadas_esperadas = {p["partido"].get("jornada") for p in partidos_grupo
+                              if p["partido"].get("jornada")}
+        for p in partidos_grupo:
+            jp = p["json_path"]
+            if jp not in json_paths_vistos:
+                json_paths_vistos.add(jp)
+                ids = await asyncio.to_thread(actualizar_json, jp, p.get("data"),
+                                              partidos_web, jornadas_esperadas)
+                ids_encontrados.update(ids)
+                actualizados += len(ids)
+
+        for p in partidos_grupo:
+            pid = p["pid"]
+            if pid in ids_encontrados:
+                intentos.pop(pid, None)
+            else:
+                info = _sumar_intento(pid)
+                n = info["intentos"]
+                pt = p["partido"]
+                if n >= MAX_INTENTOS:
+                    logger.info(f"  RENDIDO ({n}/{MAX_INTENTOS}): {pt.get('equipo','?')} vs {pt.get('rival','?')}")
+                    # Marcar como Aplazado o Esperando resultado según contexto
+                    await asyncio.to_thread(marcar_estado_sin_resultado,
+                                            p["json_path"], pid, partidos_web, p.get("data"))
                 else:
-                    info = intentos.get(pid, {"intentos": 0})
-                    info["intentos"] = info.get("intentos", 0) + 1
-                    info["ultimo"] = datetime.now().isoformat()
-                    intentos[pid] = info
-                    n = info["intentos"]
-                    pt = p["partido"]
-                    if n >= MAX_INTENTOS:
-                        logger.info(f"  RENDIDO ({n}/{MAX_INTENTOS}): {pt.get('equipo','?')} vs {pt.get('rival','?')}")
-                        # Marcar como Aplazado o Esperando resultado según contexto
-                        marcar_estado_sin_resultado(p["json_path"], pid, partidos_web)
-                    else:
-                        logger.info(f"  Sin resultado ({n}/{MAX_INTENTOS}). Se reintentara en ~{RETRY_INTERVAL_MIN}min.")
-
-            await pausa(1.0, 2.0)
+                    logger.info(f"  Sin resultado ({n}/{MAX_INTENTOS}). Se reintentara en ~{RETRY_INTERVAL_MIN}min.")
 
-    except Exception as e:
-        logger.error(f"Error: {e}", exc_info=True)
+        return actualizados
+
+    try:
+        resultados = await asyncio.gather(
+            *(procesar_un_grupo(k, v) for k, v in grupos.items()),
+            return_exceptions=True,
+        )
+        for r in resultados:
+            if isinstance(r, Exception):
+                logger.error(f"Error: {r}", exc_info=r)
+            else:
+                total_actualizados += r
     finally:
-        await browser.close()
-        await pw_inst.stop()
+        await context.close()
+        if browser_propio:
+            await browser.close()
+            await pw_inst.stop()
         guardar_intentos(intentos)
+        # Persistir las entradas refrescadas por actualizar_json: la próxima
+        # invocación en frío se las encuentra ya parseadas
+        _guardar_json_cache()
 
     logger.info(f"\n{'=' * 60}")
     logger.info(f"RESUMEN: {total_actualizados} resultado(s) de {len(pendientes)} pendiente(s)")
@@ -797,25 +1534,88 @@ async def actualizar_resultados(headless: bool = False, check_only: bool = False
     return total_actualizados
 
 
+# ─── Modo watcher ────────────────────────────────────────────────────────────
+
+def _segundos_hasta_proximo_slot(intervalo_min: int) -> float:
+    """Segundos hasta el próximo múltiplo de intervalo_min del reloj de pared
+    (:00, :05, :10...). Dormir hasta el slot en vez de un intervalo fijo evita
+    que los ticks deriven con lo que tarde cada pasada."""
+    ahora = datetime.now()
+    siguiente = ((ahora.minute // intervalo_min) + 1) * intervalo_min
+    objetivo = ahora.replace(second=0, microsecond=0) + timedelta(minutes=siguiente - ahora.minute)
+    return max(1.0, (objetivo - ahora).total_seconds())
+
+async def modo_watcher(headless: bool = True):
+    """
+    Bucle del watcher: mantiene un único Chromium vivo entre pasadas en vez de
+    relanzarlo (y re-resolver el challenge de CF) cada {RETRY_INTERVAL_MIN} min.
+    Cada pasada crea su propio contexto fresco y lo cierra al terminar.
+    """
+    logger.info(f"Watcher activado: comprobando cada {RETRY_INTERVAL_MIN} min")
+    pw, browser = await crear_browser(headless=headless)
+    try:
+        while True:
+            # Chequeo de salud: si Chromium murió entre pasadas (crash, OOM),
+            # se relanza en vez de dejar el bucle fallando hasta el reinicio
+            if not browser.is_connected():
+                logger.warning("Chromium desconectado; relanzando navegador")
+                try:
+                    await browser.close()
+                    await pw.stop()
+                except Exception:
+                    pass
+                pw, browser = await crear_browser(headless=headless)
+            try:
+                # Sonda barata antes de la pasada completa: fuera de horario
+                # de partidos el tick se queda en stats de fichero + caché
+                hay = await asyncio.to_thread(buscar_partidos_pendientes, True)
+                if hay:
+                    await actualizar_resultados(headless=headless, browser=browser)
+                else:
+                    logger.info("Sin pendientes; tick barato")
+            except Exception as e:
+                logger.error(f"Error en la pasada: {e}", exc_info=True)
+            espera = _segundos_hasta_proximo_slot(RETRY_INTERVAL_MIN)
+            logger.info(f"Proxima comprobacion en {espera / 60:.1f} min")
+            await asyncio.sleep(espera)
+    finally:
+        await browser.close()
+        await pw.stop()
+
+
 # ─── CLI ─────────────────────────────────────────────────────────────────────
 
 def main():
+    # uvloop reduce el overhead de scheduling de los muchos awaits cortos;
+    # solo existe en POSIX (el watcher de Windows sigue con el loop estándar)
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+
     parser = argparse.ArgumentParser(
         description=f"Scraper rapido de resultados {TEAM_NAME} (max {MAX_INTENTOS} intentos)"
     )
     parser.add_argument("--check", action="store_true",
                         help="Solo mostrar pendientes (sin scraping)")
-    parser.add_argument("--headless", action="store_true",
-                        help="Modo headless")
+    parser.add_argument("--headed", action="store_true",
+                        help="Abrir el navegador visible (depuración; por defecto headless)")
     parser.add_argument("--reset", action="store_true",
                         help="Limpiar estado de intentos")
+    parser.add_argument("--watch", action="store_true",
+                        help=f"Bucle continuo cada {RETRY_INTERVAL_MIN} min con el navegador ya abierto")
     args = parser.parse_args()
 
     if args.reset:
         resetear_intentos()
         return
 
-    asyncio.run(actualizar_resultados(headless=args.headless, check_only=args.check))
+    if args.watch:
+        asyncio.run(modo_watcher(headless=not args.headed))
+    else:
+        asyncio.run(actualizar_resultados(headless=not args.headed, check_only=args.check))
 
 
 if __name__ == "__main__":
@@ -3,16 +3,16 @@ title ADESA 80 - Watcher de Resultados
 cd /d "%~dp0"
 echo ============================================
 echo  ADESA 80 - Scraper automatico de resultados
-echo  Se ejecuta cada 5 min en horario de partidos
+echo  Comprueba pendientes en bucle (navegador persistente)
 echo  Cierra esta ventana para detenerlo
 echo ============================================
 echo.
 
 :loop
 echo.
-echo [%date% %time%] Comprobando partidos pendientes...
-.venv\Scripts\python.exe scraper_resultados.py
+echo [%date% %time%] Arrancando watcher (navegador persistente)...
+.venv\Scripts\python.exe scraper_resultados.py --watch
 echo.
-echo Esperando 5 minutos para el siguiente chequeo...
-timeout /t 300 /nobreak >nul
+echo El watcher se ha detenido; reiniciando en 30 segundos...
+timeout /t 30 /nobreak >nul
 goto loop